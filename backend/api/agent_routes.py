@@ -10,14 +10,85 @@ from data.collector import BaseGasCollector
 from data.database import DatabaseManager
 from utils.logger import logger
 from api.cache import cached
-from datetime import datetime
+from api.utils import prebuilt_json, static_json_response
+from models.advanced_features import create_advanced_features
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import importlib
+import threading
+import time
 import traceback
+import numpy as np
+import pandas as pd
 
 agent_bp = Blueprint('agent', __name__)
 
 collector = BaseGasCollector()
 db = DatabaseManager()
 
+# One worker per horizon; sklearn/numpy release the GIL inside predict
+_predict_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix='agent-predict')
+
+# Longest lookback in create_advanced_features (lag_2016) plus the current row
+FEATURE_WINDOW = 2017
+
+# Trailing history and the feature row derived from it, updated incrementally
+_feature_lock = threading.Lock()
+_feature_cache = {'ts': None, 'history': deque(maxlen=FEATURE_WINDOW), 'X_latest': None}
+
+# api.routes module, see _routes()
+_routes_mod = None
+
+# Last predictions and the history timestamp they were computed from
+_pred_lock = threading.Lock()
+_PRED_STATE = {'ts': None, 'value': None}
+
+# Current gas and 24h history, refreshed by a background thread so
+# requests never wait on the RPC or the history query. Each part is stamped
+# when it was last refreshed successfully, and is ignored once older than
+# SNAPSHOT_MAX_AGE (the refresher keeps failing), so requests fetch directly
+SNAPSHOT_REFRESH_INTERVAL = 30
+SNAPSHOT_MAX_AGE = 2 * SNAPSHOT_REFRESH_INTERVAL
+_snapshot_lock = threading.Lock()
+_snapshot = {'current': None, 'current_ts': None, 'history': None, 'history_ts': None}
+_refresher_started = False
+
+# Actions the agent can recommend, as listed by /agent/actions
+AGENT_ACTIONS = [
+    {
+        'id': 'WAIT',
+        'name': 'Wait',
+        'description': 'Hold off on submitting. The agent expects better gas prices soon.',
+        'risk': 'low',
+        'speed': 'slow'
+    },
+    {
+        'id': 'SUBMIT_NOW',
+        'name': 'Submit Now',
+        'description': 'Submit transaction at current gas price. Good timing detected.',
+        'risk': 'low',
+        'speed': 'normal'
+    },
+    {
+        'id': 'SUBMIT_LOW',
+        'name': 'Submit Low',
+        'description': 'Submit at 10% below current price. Saves gas but may fail (~15% risk).',
+        'risk': 'medium',
+        'speed': 'slow'
+    },
+    {
+        'id': 'SUBMIT_HIGH',
+        'name': 'Submit High',
+        'description': 'Submit at 10% above current price. Faster confirmation, higher cost.',
+        'risk': 'very_low',
+        'speed': 'fast'
+    }
+]
+
+# Constant payload, serialized once at import
+_AGENT_ACTIONS_JSON = prebuilt_json({'success': True, 'actions': AGENT_ACTIONS})
+
 
 @agent_bp.route('/agent/recommend', methods=['POST'])
 def get_recommendation():
@@ -49,56 +120,35 @@ def get_recommendation():
         }
     }
     """
-    try:
-        data = request.get_json() or {}
-        urgency = float(data.get('urgency', 0.5))
-        urgency = max(0.0, min(1.0, urgency))  # Clamp to 0-1
+    data = request.get_json(silent=True) or {}
+    return _recommendation_response(data.get('urgency', 0.5))
 
-        # Get current gas price
-        current_data = collector.get_current_gas()
-        if not current_data:
-            return jsonify({
-                'success': False,
-                'error': 'No current gas data available'
-            }), 503
 
-        current_gas = current_data.get('current_gas', 0.01)
+@agent_bp.route('/agent/recommend', methods=['GET'])
+def get_recommendation_simple():
+    """
+    Simple GET endpoint for agent recommendation with default urgency
 
-        # Get predictions
-        predictions = _get_predictions()
+    Query params:
+    - urgency: float (0-1), default 0.5
 
-        # Get agent recommendation
-        agent = get_agent_service()
+    Returns same format as POST endpoint
+    """
+    return _recommendation_response(request.args.get('urgency', 0.5))
 
-        # Update agent's statistics with recent data
-        recent_prices = db.get_historical_data(hours=24)
-        if recent_prices:
-            gas_prices = [r.get('gwei') or r.get('current_gas') or r.get('gas_price', 0.01) for r in recent_prices]
-            agent.update_statistics(gas_prices)
 
-        recommendation = agent.get_recommendation(
-            current_gas=current_gas,
-            predictions=predictions,
-            urgency=urgency
-        )
+def _recommendation_response(raw_urgency):
+    """Parse and clamp urgency, then serve the shared cached payload"""
+    try:
+        urgency = max(0.0, min(1.0, float(raw_urgency)))  # Clamp to 0-1
 
-        return jsonify({
-            'success': True,
-            'recommendation': {
-                'action': recommendation.action,
-                'confidence': round(recommendation.confidence, 3),
-                'recommended_gas': round(recommendation.recommended_gas, 8),
-                'expected_savings': round(recommendation.expected_savings, 8),
-                'reasoning': recommendation.reasoning,
-                'q_values': {k: round(v, 4) for k, v in recommendation.q_values.items()},
-                'urgency_factor': recommendation.urgency_factor
-            },
-            'context': {
-                'current_gas': current_gas,
-                'predictions': predictions,
-                'timestamp': datetime.now().isoformat()
-            }
-        })
+        if not _get_current_gas():
+            return jsonify({
+                'success': False,
+                'error': 'No current gas data available'
+            }), 503
+
+        return jsonify(_build_recommendation_payload(round(urgency, 2)))
 
     except Exception as e:
         logger.error(f"Agent recommendation error: {e}")
@@ -109,65 +159,111 @@ def get_recommendation():
         }), 500
 
 
-@agent_bp.route('/agent/recommend', methods=['GET'])
-@cached(ttl=30)
-def get_recommendation_simple():
+@cached(ttl=30, vary_on_query=False)
+def _build_recommendation_payload(urgency: float) -> dict:
     """
-    Simple GET endpoint for agent recommendation with default urgency
-
-    Query params:
-    - urgency: float (0-1), default 0.5
+    Recommendation payload for a given urgency
 
-    Returns same format as POST endpoint
+    Shared by GET and POST; urgency is rounded by the caller so polling
+    clients with the same setting hit the same cache entry.
     """
-    try:
-        urgency = float(request.args.get('urgency', 0.5))
-        urgency = max(0.0, min(1.0, urgency))
+    current_data = _get_current_gas()
+    current_gas = current_data.get('current_gas', 0.01)
 
-        # Get current gas price
-        current_data = collector.get_current_gas()
-        if not current_data:
-            return jsonify({
-                'success': False,
-                'error': 'No current gas data available'
-            }), 503
+    # Get predictions
+    predictions = _get_predictions()
 
-        current_gas = current_data.get('current_gas', 0.01)
+    # Get agent recommendation
+    agent = get_agent_service()
+    recommendation = agent.get_recommendation(
+        current_gas=current_gas,
+        predictions=predictions,
+        urgency=urgency
+    )
 
-        # Get predictions
-        predictions = _get_predictions()
+    return {
+        'success': True,
+        'recommendation': {
+            'action': recommendation.action,
+            'confidence': round(recommendation.confidence, 3),
+            'recommended_gas': round(recommendation.recommended_gas, 8),
+            'expected_savings': round(recommendation.expected_savings, 8),
+            'reasoning': recommendation.reasoning,
+            'q_values': {k: round(v, 4) for k, v in recommendation.q_values.items()},
+            'urgency_factor': recommendation.urgency_factor
+        },
+        'context': {
+            'current_gas': current_gas,
+            'predictions': predictions,
+            'timestamp': datetime.now().isoformat()
+        }
+    }
 
-        # Get agent recommendation
-        agent = get_agent_service()
-        recommendation = agent.get_recommendation(
-            current_gas=current_gas,
-            predictions=predictions,
-            urgency=urgency
-        )
 
-        return jsonify({
-            'success': True,
-            'recommendation': {
-                'action': recommendation.action,
-                'confidence': round(recommendation.confidence, 3),
-                'recommended_gas': round(recommendation.recommended_gas, 8),
-                'expected_savings': round(recommendation.expected_savings, 8),
-                'reasoning': recommendation.reasoning,
-                'urgency_factor': recommendation.urgency_factor
-            },
-            'context': {
-                'current_gas': current_gas,
-                'predictions': predictions,
-                'timestamp': datetime.now().isoformat()
-            }
-        })
+def _refresh_snapshot():
+    """Fetch current gas and the last 24h of prices, and update agent statistics"""
+    try:
+        current = collector.get_current_gas()
+        if current:
+            with _snapshot_lock:
+                _snapshot['current'] = current
+                _snapshot['current_ts'] = time.time()
+    except Exception as e:
+        logger.warning(f"Could not refresh agent snapshot current gas: {e}")
 
+    try:
+        history = db.get_historical_data(hours=24)
+        if history:
+            get_agent_service().update_statistics([_gas_price(r) for r in history])
+        with _snapshot_lock:
+            _snapshot['history'] = history
+            _snapshot['history_ts'] = time.time()
     except Exception as e:
-        logger.error(f"Agent recommendation error: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.warning(f"Could not refresh agent snapshot history: {e}")
+
+
+def _fresh_snapshot(part):
+    """The snapshot's `part` if refreshed within SNAPSHOT_MAX_AGE, else None"""
+    with _snapshot_lock:
+        value, ts = _snapshot[part], _snapshot[part + '_ts']
+    if ts is None or time.time() - ts > SNAPSHOT_MAX_AGE:
+        return None
+    return value
+
+
+def _snapshot_refresher():
+    """Refresh the snapshot every SNAPSHOT_REFRESH_INTERVAL seconds"""
+    while True:
+        _refresh_snapshot()
+        time.sleep(SNAPSHOT_REFRESH_INTERVAL)
+
+
+def _start_snapshot_refresher():
+    """
+    Start the refresher thread on first use
+
+    Started lazily rather than at import: with preload_app the module is
+    imported in the gunicorn master, and threads do not survive the fork.
+    """
+    global _refresher_started
+    with _snapshot_lock:
+        if _refresher_started:
+            return
+        _refresher_started = True
+    threading.Thread(target=_snapshot_refresher, name="AgentSnapshot", daemon=True).start()
+
+
+@agent_bp.route('/admin/refresh', methods=['POST'])
+def refresh_snapshot():
+    """Force a refresh of the current gas / history snapshot (admin endpoint)"""
+    _refresh_snapshot()
+    with _snapshot_lock:
+        refreshed = _snapshot['current_ts']
+    logger.info("Agent snapshot refreshed by request")
+    return jsonify({
+        'success': True,
+        'refreshed_at': datetime.fromtimestamp(refreshed).isoformat() if refreshed else None
+    })
 
 
 @agent_bp.route('/agent/status', methods=['GET'])
@@ -223,41 +319,7 @@ def get_available_actions():
         ]
     }
     """
-    actions = [
-        {
-            'id': 'WAIT',
-            'name': 'Wait',
-            'description': 'Hold off on submitting. The agent expects better gas prices soon.',
-            'risk': 'low',
-            'speed': 'slow'
-        },
-        {
-            'id': 'SUBMIT_NOW',
-            'name': 'Submit Now',
-            'description': 'Submit transaction at current gas price. Good timing detected.',
-            'risk': 'low',
-            'speed': 'normal'
-        },
-        {
-            'id': 'SUBMIT_LOW',
-            'name': 'Submit Low',
-            'description': 'Submit at 10% below current price. Saves gas but may fail (~15% risk).',
-            'risk': 'medium',
-            'speed': 'slow'
-        },
-        {
-            'id': 'SUBMIT_HIGH',
-            'name': 'Submit High',
-            'description': 'Submit at 10% above current price. Faster confirmation, higher cost.',
-            'risk': 'very_low',
-            'speed': 'fast'
-        }
-    ]
-
-    return jsonify({
-        'success': True,
-        'actions': actions
-    })
+    return static_json_response(_AGENT_ACTIONS_JSON)
 
 
 @agent_bp.route('/agent/simulate', methods=['POST'])
@@ -294,7 +356,7 @@ def simulate_episode():
             }), 503
 
         # Get historical data for simulation
-        historical = db.get_historical_data(hours=2)
+        historical = _recent_history(hours=2)
         if not historical or len(historical) < num_steps:
             return jsonify({
                 'success': False,
@@ -305,15 +367,17 @@ def simulate_episode():
         steps = []
         final_action = None
 
-        for i in range(num_steps):
-            gas_price = historical[i].get('gwei') or historical[i].get('current_gas') or historical[i].get('gas_price', 0.01)
+        gas_prices = [_gas_price(r) for r in historical[:num_steps]]
 
-            recommendation = agent.get_recommendation(
-                current_gas=gas_price,
-                predictions=predictions,
-                urgency=urgency
-            )
+        # Score every step in one batched forward pass, then replay until
+        # the agent stops waiting
+        recommendations = agent.get_recommendations_batch(
+            gas_prices=gas_prices,
+            predictions=predictions,
+            urgency=urgency
+        )
 
+        for i, (gas_price, recommendation) in enumerate(zip(gas_prices, recommendations)):
             step_data = {
                 'step': i,
                 'gas_price': gas_price,
@@ -345,64 +409,155 @@ def simulate_episode():
         }), 500
 
 
-def _get_predictions() -> dict:
-    """Get current predictions from the prediction models"""
-    try:
-        # Import here to avoid circular imports
-        from api.routes import models, scalers, engineer
+def _gas_price(row, default=0.01):
+    """
+    Gas price of a history row, whichever key it is stored under
 
-        current_data = collector.get_current_gas()
-        if not current_data:
-            return {'1h': 0.01, '4h': 0.01, '24h': 0.01}
+    Checks `is not None` rather than truthiness so a 0.0 price is kept.
+    """
+    for key in ('gwei', 'current_gas', 'gas_price'):
+        value = row.get(key)
+        if value is not None:
+            return value
+    return default
 
-        current_gas = current_data.get('current_gas', 0.01)
 
-        # Try to get actual predictions
-        historical = db.get_historical_data(hours=24)
-        if not historical or not models:
-            return {'1h': current_gas, '4h': current_gas, '24h': current_gas}
+def _routes():
+    """
+    api.routes, imported on first use
+
+    It loads the prediction models at import time, so it is resolved
+    lazily rather than when this blueprint is registered.
+    """
+    global _routes_mod
+    if _routes_mod is None:
+        _routes_mod = importlib.import_module('api.routes')
+    return _routes_mod
+
+
+def _get_current_gas():
+    """Get current gas data, shared by the route and prediction lookups"""
+    _start_snapshot_refresher()
+    current = _fresh_snapshot('current')
+    # Until the first refresh lands, or if refreshes keep failing, fetch directly
+    return current if current is not None else _fetch_current_gas()
+
+
+def _recent_history(hours):
+    """Rows from the last `hours` (up to 24) of the snapshot history"""
+    _start_snapshot_refresher()
+    history = _fresh_snapshot('history')
+    if history is None:
+        return db.get_historical_data(hours=hours)
+    cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+    return [r for r in history if r['timestamp'] >= cutoff]
+
 
-        import pandas as pd
-        from models.advanced_features import create_advanced_features
-        import numpy as np
+@cached(ttl=5, vary_on_query=False)
+def _fetch_current_gas():
+    """Current gas straight from the collector"""
+    return collector.get_current_gas()
 
-        df = pd.DataFrame(historical)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], format='mixed')
-        df = df.sort_values('timestamp')
 
+def _latest_features():
+    """
+    Feature row for the most recent gas price, or None without history
+
+    Only rows newer than the last one seen are fetched from the database.
+    Features are rebuilt over the trailing FEATURE_WINDOW rows, and only
+    when new data has arrived since the previous call.
+    """
+
+    with _feature_lock:
+        history = _feature_cache['history']
+        since = datetime.fromisoformat(_feature_cache['ts']) if _feature_cache['ts'] else None
+
+        new_rows = db.get_historical_data(hours=24, since=since)
+        if not new_rows and _feature_cache['X_latest'] is not None:
+            return _feature_cache['X_latest']
+
+        history.extend(sorted(new_rows, key=lambda r: r['timestamp']))
+        if history:
+            _feature_cache['ts'] = history[-1]['timestamp']
+        cutoff = (datetime.now() - timedelta(hours=24)).isoformat()
+        while history and history[0]['timestamp'] < cutoff:
+            history.popleft()
+        if not history:
+            return None
+
+        df = pd.DataFrame(list(history))
         if 'gas_price' not in df.columns:
             df['gas_price'] = df.get('gwei', df.get('current_gas', 0.01))
 
         X, _ = create_advanced_features(df)
 
-        predictions = {}
+        _feature_cache['X_latest'] = X.iloc[-1:]
+        return _feature_cache['X_latest']
+
+
+def _compute_predictions() -> dict:
+    """Get current predictions from the prediction models"""
+    try:
+        routes = _routes()
+        models, scalers = routes.models, routes.scalers
+
+        current_data = _get_current_gas()
+        if not current_data:
+            return {'1h': 0.01, '4h': 0.01, '24h': 0.01}
+
+        current_gas = current_data.get('current_gas', 0.01)
+
+        # Try to get actual predictions
+        X_latest = _latest_features() if models else None
+        if X_latest is None:
+            return {'1h': current_gas, '4h': current_gas, '24h': current_gas}
+
+        # No new gas rows since the last pass means the same feature row,
+        # so the same predictions
+        ts = _feature_cache['ts']
+        with _pred_lock:
+            if ts and ts == _PRED_STATE['ts']:
+                return dict(_PRED_STATE['value'])
+
+        # Scale once per distinct scaler, then fan the independent
+        # per-horizon predicts out across the executor
+        scaled_by_scaler = {}
+        futures = {}
         for horizon in ['1h', '4h', '24h']:
             if horizon in models and models[horizon].get('model'):
-                model_data = models[horizon]
-                model = model_data['model']
                 scaler = scalers.get(horizon)
+                if id(scaler) not in scaled_by_scaler:
+                    scaled_by_scaler[id(scaler)] = scaler.transform(X_latest) if scaler else X_latest.values
+                futures[horizon] = _predict_executor.submit(
+                    models[horizon]['model'].predict, scaled_by_scaler[id(scaler)]
+                )
 
-                X_latest = X.iloc[-1:].copy()
-
-                if scaler:
-                    X_scaled = scaler.transform(X_latest)
-                else:
-                    X_scaled = X_latest.values
-
-                pred = model.predict(X_scaled)[0]
+        predictions = {}
+        for horizon in ['1h', '4h', '24h']:
+            if horizon in futures:
+                pred = futures[horizon].result()[0]
 
                 # Handle log-scale predictions
-                if model_data.get('uses_log_scale'):
+                if models[horizon].get('uses_log_scale'):
                     pred = np.exp(pred) - 1e-8
 
                 predictions[horizon] = float(pred)
             else:
                 predictions[horizon] = current_gas
 
+        with _pred_lock:
+            _PRED_STATE['ts'] = ts
+            _PRED_STATE['value'] = dict(predictions)
+
         return predictions
 
     except Exception as e:
         logger.warning(f"Could not get predictions: {e}")
-        current_data = collector.get_current_gas()
+        current_data = _get_current_gas()
         current_gas = current_data.get('current_gas', 0.01) if current_data else 0.01
         return {'1h': current_gas, '4h': current_gas, '24h': current_gas}
+
+
+# History only advances about once a minute, so concurrent requests within
+# the same 30s window share a single feature build + inference pass
+_get_predictions = cached(ttl=30, vary_on_query=False)(_compute_predictions)
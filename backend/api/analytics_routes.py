@@ -9,6 +9,7 @@ from utils.prediction_validator import PredictionValidator
 from data.database import DatabaseManager
 from utils.logger import logger
 from api.cache import cached
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import traceback
 import numpy as np
@@ -18,9 +19,16 @@ analytics_bp = Blueprint('analytics', __name__)
 validator = PredictionValidator()
 db = DatabaseManager()
 
+# Upper bound on rows returned by /recent-predictions
+MAX_RECENT_PREDICTIONS = 500
+
+# Runs the dashboard's independent queries concurrently; shared by all
+# requests, and threads are only started on first use
+_dashboard_executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix='dashboard')
+
 
 @analytics_bp.route('/performance', methods=['GET'])
-@cached(ttl=300)  # Cache for 5 minutes
+@cached(ttl=300, etag=True)  # Cache for 5 minutes
 def get_performance_metrics():
     """
     Get current model performance metrics
@@ -58,7 +66,7 @@ def get_performance_metrics():
 
 
 @analytics_bp.route('/trends', methods=['GET'])
-@cached(ttl=600)  # Cache for 10 minutes
+@cached(ttl=600, etag=True)  # Cache for 10 minutes
 def get_performance_trends():
     """
     Get performance trends over time
@@ -143,9 +151,12 @@ def get_collection_stats():
                 'hours': hours
             }), 404
 
-        # Extract gas prices
-        gas_prices = [d.get('gwei', 0) for d in data]
-        timestamps = [d.get('timestamp', '') for d in data]
+        # Extract gas prices once; every reduction below runs over this array
+        gas_prices = np.asarray([d.get('gwei', 0) for d in data], dtype=np.float64)
+        mean = gas_prices.mean()
+        std = gas_prices.std()
+        mn = gas_prices.min()
+        mx = gas_prices.max()
 
         # Calculate statistics
         stats = {
@@ -154,17 +165,17 @@ def get_collection_stats():
             'expected_records': hours * 60,  # 1 per minute
             'collection_rate': len(data) / (hours * 60) if hours > 0 else 0,
             'gas_price': {
-                'current': gas_prices[-1] if gas_prices else None,
-                'min': min(gas_prices) if gas_prices else None,
-                'max': max(gas_prices) if gas_prices else None,
-                'avg': np.mean(gas_prices) if gas_prices else None,
-                'median': np.median(gas_prices) if gas_prices else None,
-                'std': np.std(gas_prices) if gas_prices else None,
+                'current': float(gas_prices[-1]),
+                'min': float(mn),
+                'max': float(mx),
+                'avg': float(mean),
+                'median': float(np.median(gas_prices)),
+                'std': float(std),
             },
             'volatility': {
-                'coefficient_of_variation': (np.std(gas_prices) / np.mean(gas_prices)) if gas_prices and np.mean(gas_prices) > 0 else None,
-                'price_range': (max(gas_prices) - min(gas_prices)) if gas_prices else None,
-                'spikes_detected': sum(1 for p in gas_prices if p > np.mean(gas_prices) + 2 * np.std(gas_prices)) if len(gas_prices) > 10 else 0
+                'coefficient_of_variation': float(std / mean) if mean > 0 else None,
+                'price_range': float(mx - mn),
+                'spikes_detected': int((gas_prices > mean + 2 * std).sum()) if gas_prices.size > 10 else 0
             },
             'timestamp': datetime.now().isoformat()
         }
@@ -178,7 +189,7 @@ def get_collection_stats():
 
 
 @analytics_bp.route('/dashboard', methods=['GET'])
-@cached(ttl=300)  # Cache for 5 minutes
+@cached(ttl=300, etag=True)  # Cache for 5 minutes
 def get_analytics_dashboard():
     """
     Comprehensive analytics dashboard data
@@ -186,19 +197,23 @@ def get_analytics_dashboard():
     Returns all key metrics in one endpoint for dashboard display
     """
     try:
-        # Get performance metrics for all horizons (last 7 days)
-        performance_metrics = {}
-        for horizon in ['1h', '4h', '24h']:
-            performance_metrics[horizon] = validator.calculate_metrics(horizon=horizon, days=7)
-
-        # Get validation summary
-        validation = validator.get_validation_summary()
+        # The underlying queries are independent and each opens its own
+        # session, so run them concurrently rather than back to back
+        # Performance metrics for all horizons (last 7 days)
+        metrics_futures = {
+            horizon: _dashboard_executor.submit(validator.calculate_metrics, horizon=horizon, days=7)
+            for horizon in ['1h', '4h', '24h']
+        }
+        validation_future = _dashboard_executor.submit(validator.get_validation_summary)
+        health_future = _dashboard_executor.submit(validator.check_model_health)
+        collection_future = _dashboard_executor.submit(db.get_historical_data, hours=24)
 
-        # Get model health
-        health = validator.check_model_health()
+        performance_metrics = {h: f.result() for h, f in metrics_futures.items()}
+        validation = validation_future.result()
+        health = health_future.result()
+        collection_24h = collection_future.result()
 
         # Get collection stats
-        collection_24h = db.get_historical_data(hours=24)
         collection_stats = {
             'records_24h': len(collection_24h),
             'expected_records': 24 * 60,  # 1 per minute
@@ -250,18 +265,29 @@ def get_recent_predictions():
     Get recent predictions with validation status
 
     Query params:
-        limit: Number of predictions to return (default: 20)
+        limit: Number of predictions to return (default: 20, max: 500)
         validated_only: Only return validated predictions (default: false)
     """
     try:
-        limit = request.args.get('limit', 20, type=int)
+        limit = min(request.args.get('limit', 20, type=int), MAX_RECENT_PREDICTIONS)
         validated_only = request.args.get('validated_only', 'false').lower() == 'true'
 
-        session = db._get_session()
-        try:
+        with db.Session() as session:
             from utils.prediction_validator import PredictionLog
 
-            query = session.query(PredictionLog)
+            # Column tuples only - skips ORM instance hydration
+            query = session.query(
+                PredictionLog.id,
+                PredictionLog.prediction_time,
+                PredictionLog.target_time,
+                PredictionLog.horizon,
+                PredictionLog.predicted_gas,
+                PredictionLog.actual_gas,
+                PredictionLog.absolute_error,
+                PredictionLog.direction_correct,
+                PredictionLog.validated,
+                PredictionLog.model_version
+            )
 
             if validated_only:
                 query = query.filter(PredictionLog.validated == True)
@@ -270,19 +296,26 @@ def get_recent_predictions():
                 PredictionLog.prediction_time.desc()
             ).limit(limit).all()
 
-            results = [{
-                'id': p.id,
-                'prediction_time': p.prediction_time.isoformat(),
-                'target_time': p.target_time.isoformat(),
-                'horizon': p.horizon,
-                'predicted_gas': round(p.predicted_gas, 6),
-                'actual_gas': round(p.actual_gas, 6) if p.actual_gas else None,
-                'error': round(p.absolute_error, 6) if p.absolute_error else None,
-                'error_percentage': round((p.absolute_error / p.actual_gas * 100), 2) if p.actual_gas and p.absolute_error else None,
-                'direction_correct': p.direction_correct,
-                'validated': p.validated,
-                'model_version': p.model_version
-            } for p in predictions]
+            # Unpack the row tuples positionally and bind round() locally;
+            # Row attribute access goes through a per-field lookup
+            results = []
+            append = results.append
+            rnd = round
+            for (pred_id, prediction_time, target_time, horizon, predicted_gas, actual_gas,
+                 absolute_error, direction_correct, validated, model_version) in predictions:
+                append({
+                    'id': pred_id,
+                    'prediction_time': prediction_time.isoformat(),
+                    'target_time': target_time.isoformat(),
+                    'horizon': horizon,
+                    'predicted_gas': rnd(predicted_gas, 6),
+                    'actual_gas': rnd(actual_gas, 6) if actual_gas else None,
+                    'error': rnd(absolute_error, 6) if absolute_error else None,
+                    'error_percentage': rnd(absolute_error / actual_gas * 100, 2) if actual_gas and absolute_error else None,
+                    'direction_correct': direction_correct,
+                    'validated': validated,
+                    'model_version': model_version
+                })
 
             return jsonify({
                 'predictions': results,
@@ -291,9 +324,6 @@ def get_recent_predictions():
                 'timestamp': datetime.now().isoformat()
             })
 
-        finally:
-            session.close()
-
     except Exception as e:
         logger.error(f"Error in /analytics/recent-predictions: {traceback.format_exc()}")
         return jsonify({'error': str(e)}), 500
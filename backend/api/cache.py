@@ -1,42 +1,283 @@
-from cachetools import TTLCache
-from functools import wraps
+from cachetools import LRUCache, TTLCache
+from flask import Response, has_request_context, request
 import hashlib
-import json
+from collections import namedtuple
+from functools import wraps
+import threading
+import time
+from config import Config
 from utils.logger import logger
 
+# Optional Redis backend shared across gunicorn workers
+try:
+    import orjson
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
 
 # In-memory cache (5 minutes TTL, max 100 items)
 cache = TTLCache(maxsize=100, ttl=300)
 
+# TTLCache is not thread-safe; guards cache and in-flight bookkeeping
+_lock = threading.RLock()
+
+# Keys currently being computed, so concurrent misses wait instead of recomputing
+_inflight = {}
+
+# Upper bound on how long a waiting request blocks on another's computation
+INFLIGHT_TIMEOUT = 30
+
+# Last stored result per view/arguments, regardless of time bucket, as
+# (bucket, entry); served to concurrent callers while one of them recomputes
+_stale = LRUCache(maxsize=100)
+
+_MISSING = object()
+
+# Shared cache, enabled by REDIS_URL; None means per-process only
+_redis = None
+if Config.REDIS_URL:
+    if REDIS_AVAILABLE:
+        _redis = redis.Redis.from_url(Config.REDIS_URL, socket_timeout=1)
+    else:
+        logger.warning("REDIS_URL is set but redis/orjson are not installed - using in-process cache")
+
+REDIS_PREFIX = 'cache:'
+
+# A view's response as stored in the in-process cache: its serialized body
+# and headers, plus the explicit status of a (response, status) return
+_FrozenResponse = namedtuple('_FrozenResponse', 'body status headers tuple_status')
+
 
 def cache_key(*args, **kwargs):
-    """Generate cache key from arguments"""
-    key_data = json.dumps({'args': args, 'kwargs': kwargs}, sort_keys=True)
-    return hashlib.md5(key_data.encode()).hexdigest()
+    """Generate cache key from arguments (must be hashable)"""
+    return args + tuple(sorted(kwargs.items()))
+
+
+def _request_key():
+    """Query-string params of the active request, if any"""
+    if not has_request_context():
+        return ()
+    return tuple(sorted(request.args.items(multi=True)))
+
+
+def _encode_response(response):
+    """JSON responses as [body, status, headers]; None for anything else"""
+    if response.mimetype != 'application/json':
+        return None
+    headers = [[k, v] for k, v in response.headers.items() if k in ('ETag', 'Cache-Control')]
+    return [response.get_data(as_text=True), response.status_code, headers]
+
+
+def _encode(result):
+    """
+    Serialize a result for Redis, or None if it cannot be shared
+
+    Views return a Response or a (Response, status) tuple; helpers return
+    plain JSON-shaped data. Anything else stays in the per-process cache.
+    """
+    if isinstance(result, Response):
+        envelope = _encode_response(result)
+        return envelope and orjson.dumps({'response': envelope})
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], Response):
+        envelope = _encode_response(result[0])
+        return envelope and orjson.dumps({'response': envelope, 'status': result[1]})
+    try:
+        return orjson.dumps({'value': result}, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    except TypeError:
+        return None
+
+
+def _decode(raw):
+    """Inverse of _encode()"""
+    data = orjson.loads(raw)
+    if 'response' not in data:
+        return data['value']
+    body, status, headers = data['response']
+    response = Response(body, status=status, headers=headers, mimetype='application/json')
+    return (response, data['status']) if 'status' in data else response
+
+
+def _freeze(result):
+    """
+    Store responses as bytes and headers rather than the Response object
+
+    after_request hooks (CORS, rate-limit headers) modify the response they
+    are handed, so a cached Response object must not be returned twice.
+    """
+    response, tuple_status = result, None
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], Response):
+        response, tuple_status = result
+    if not isinstance(response, Response) or response.is_streamed:
+        return result
+    return _FrozenResponse(response.get_data(), response.status_code, list(response.headers.items()), tuple_status)
+
+
+def _thaw(entry):
+    """A fresh Response (or (Response, status)) for a cached entry"""
+    if not isinstance(entry, _FrozenResponse):
+        return entry
+    response = Response(entry.body, status=entry.status, headers=entry.headers)
+    return response if entry.tuple_status is None else (response, entry.tuple_status)
+
+
+def _shared_get(key):
+    """Result stored in Redis by any worker, or _MISSING"""
+    try:
+        raw = _redis.get(REDIS_PREFIX + repr(key))
+    except redis.RedisError as e:
+        logger.warning(f"Redis cache read failed: {e}")
+        return _MISSING
+    return _MISSING if raw is None else _decode(raw)
 
 
-def cached(ttl=300):
+def _shared_set(key, result, ttl):
+    """Publish a result to Redis for the other workers"""
+    raw = _encode(result)
+    if raw is None:
+        return
+    try:
+        _redis.setex(REDIS_PREFIX + repr(key), ttl, raw)
+    except redis.RedisError as e:
+        logger.warning(f"Redis cache write failed: {e}")
+
+
+def _add_etag(result):
+    """
+    Tag a successful JSON response with an ETag of its body
+
+    Cache-Control is left to the app's add_cache_headers hook, which sets
+    it per path for both the full response and the 304.
+    """
+    if isinstance(result, Response) and result.status_code == 200:
+        result.set_etag(hashlib.md5(result.get_data()).hexdigest()[:16])
+    return result
+
+
+def matching_etag(etag):
+    """
+    The If-None-Match tag naming etag, or None
+
+    flask-compress rewrites the ETag of compressed responses to
+    "<etag>:<encoding>", so clients send that form back.
+    """
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return etag
+    for tag in if_none_match.as_set(include_weak=True):
+        if tag.partition(':')[0] == etag:
+            return tag
+    return None
+
+
+def _not_modified(result):
+    """Answer a matching If-None-Match with an empty 304 instead of the body"""
+    if not (has_request_context() and isinstance(result, Response)):
+        return result
+    etag, _ = result.get_etag()
+    matched = etag and matching_etag(etag)
+    if matched:
+        # Echo the client's tag, as the compressed 200 it revalidates carried it
+        response = Response(status=304)
+        response.set_etag(matched)
+        return response
+    return result
+
+
+def cached(ttl=300, vary_on_query=True, etag=False):
     """
     Decorator to cache function results
     Usage: @cached(ttl=300)  # Cache for 5 minutes
+
+    The shared TTLCache expires entries after 5 minutes, so the key also
+    carries the current ttl-sized time bucket to honour shorter TTLs.
+    Flask views read their params from request.args rather than their
+    arguments, so the query string is part of the key as well. Helpers
+    that take everything they depend on as arguments pass
+    vary_on_query=False to share entries across requests.
+
+    Concurrent misses on the same key are single-flighted: the first caller
+    computes, the rest wait for its result. Once an entry has expired, the
+    others instead get the previous result (stale-while-revalidate) if it is
+    from the current or the previous ttl bucket.
+
+    When REDIS_URL is configured, misses also consult Redis before
+    computing, so gunicorn workers share results; the in-process cache
+    stays in front of it.
+
+    Cached responses are kept as their serialized body and headers; each
+    hit gets a new Response built from those bytes, never a shared object.
+
+    With etag=True, view responses are tagged with an ETag once when stored,
+    and clients presenting it in If-None-Match get a 304 with no body.
     """
     def decorator(func):
+        name = f"{func.__module__}.{func.__name__}"
+
+        def compute(*args, **kwargs):
+            result = func(*args, **kwargs)
+            return _add_etag(result) if etag else result
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            key = f"{func.__name__}_{cache_key(*args, **kwargs)}"
-            
-            # Check cache
-            if key in cache:
-                logger.debug(f"Cache HIT: {func.__name__}")
-                return cache[key]
-            
+            result = lookup(*args, **kwargs)
+            return _not_modified(result) if etag else result
+
+        def lookup(*args, **kwargs):
+            bucket = int(time.time() // ttl)
+            query = _request_key() if vary_on_query else ()
+            stale_key = (name, cache_key(*args, **kwargs), query)
+            key = (name, bucket) + stale_key[1:]
+
+            # Check cache, or claim the key if nobody is computing it yet
+            with _lock:
+                result = cache.get(key, _MISSING)
+                if result is not _MISSING:
+                    logger.debug(f"Cache HIT: {func.__name__}")
+                    return _thaw(result)
+                event = _inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = _inflight[key] = threading.Event()
+                else:
+                    stale = _stale.get(stale_key)
+
+            if not leader:
+                if stale is not None and stale[0] >= bucket - 1:
+                    # Someone is already refreshing this entry; serve the previous one
+                    logger.debug(f"Cache STALE: {func.__name__}")
+                    return _thaw(stale[1])
+
+                # Single-flight: wait for the in-progress computation
+                event.wait(timeout=INFLIGHT_TIMEOUT)
+                with _lock:
+                    result = cache.get(key, _MISSING)
+                if result is not _MISSING:
+                    logger.debug(f"Cache HIT (after wait): {func.__name__}")
+                    return _thaw(result)
+                # Leader failed or timed out - compute without caching
+                return compute(*args, **kwargs)
+
             # Execute function
             logger.debug(f"Cache MISS: {func.__name__}")
-            result = func(*args, **kwargs)
-            
-            # Store in cache
-            cache[key] = result
-            
+            try:
+                result = _shared_get(key) if _redis else _MISSING
+                if result is _MISSING:
+                    result = compute(*args, **kwargs)
+                    if _redis:
+                        _shared_set(key, result, ttl)
+
+                # Store in cache; hits get their own copy of a response
+                entry = _freeze(result)
+                with _lock:
+                    cache[key] = entry
+                    _stale[stale_key] = (bucket, entry)
+            finally:
+                with _lock:
+                    _inflight.pop(key, None)
+                event.set()
+
             return result
         return wrapper
     return decorator
@@ -44,6 +285,14 @@ def cached(ttl=300):
 
 def clear_cache():
     """Clear all cached data"""
-    cache.clear()
+    with _lock:
+        cache.clear()
+        _stale.clear()
+    if _redis:
+        try:
+            keys = list(_redis.scan_iter(match=REDIS_PREFIX + '*'))
+            if keys:
+                _redis.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache clear failed: {e}")
     logger.info("Cache cleared")
-
@@ -6,9 +6,13 @@ Endpoints triggered by Cloudflare Worker scheduled events for automated maintena
 from flask import Blueprint, jsonify, request
 from utils.logger import logger
 from utils.prediction_validator import PredictionValidator
-from data.database import DatabaseManager
-import subprocess
+from data.database import DatabaseManager, GasPrice, OnChainFeatures
+from sqlalchemy import func, select
+from services import retrain_jobs
 import os
+import random
+import threading
+import time
 from datetime import datetime
 import traceback
 
@@ -17,95 +21,151 @@ cron_bp = Blueprint('cron', __name__)
 db = DatabaseManager()
 validator = PredictionValidator()
 
+# Saved model files only change when retraining finishes, so the directory
+# scan is cached as (expires_at, files, last_trained) and dropped after retraining
+MODEL_FILES_TTL = 60
+MODEL_DIRS = ('models/saved_models', 'backend/models/saved_models')
+_model_files_cache = (0, [], None)
+
+# check_model_health() result shared by /model-stats and /cron/health-check
+HEALTH_TTL = 120
+_health_cache = {'value': None, 'expires': 0}
+_health_lock = threading.Lock()
+
+# Built once so each request reuses SQLAlchemy's compiled-SQL cache entry
+# Both tables' latest timestamps in one round trip
+_LATEST_TIMESTAMPS_STMT = select(
+    select(func.max(GasPrice.timestamp)).scalar_subquery(),
+    select(func.max(OnChainFeatures.timestamp)).scalar_subquery()
+)
+
+
+def get_model_files():
+    """Saved model files and the newest modification time (None without files)"""
+    global _model_files_cache
+    expires_at, files, last_trained = _model_files_cache
+    if time.monotonic() < expires_at:
+        return files, last_trained
+
+    # One directory read per candidate, stat()ing only the matching entries
+    files, last_trained = [], None
+    for models_dir in MODEL_DIRS:
+        try:
+            with os.scandir(models_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('model_') and entry.name.endswith('.pkl'):
+                        files.append(entry.path)
+                        mtime = entry.stat().st_mtime
+                        if last_trained is None or mtime > last_trained:
+                            last_trained = mtime
+        except FileNotFoundError:
+            continue
+        if files:
+            break
+
+    _model_files_cache = (time.monotonic() + MODEL_FILES_TTL, files, last_trained)
+    return files, last_trained
+
+
+def get_health(max_age=HEALTH_TTL):
+    """
+    Model health at the dashboard threshold, recomputed at most every ~max_age seconds
+
+    Expiry is jittered by up to 10% so workers that started together do not
+    all recompute at once; callers arriving during a recompute wait for it.
+    """
+    with _health_lock:
+        now = time.monotonic()
+        if _health_cache['value'] is not None and now < _health_cache['expires']:
+            return _health_cache['value']
+
+        health = validator.check_model_health(threshold_mae=0.01)
+        _health_cache['value'] = health
+        _health_cache['expires'] = now + max_age + random.uniform(0, max_age * 0.1)
+        return health
+
+
+def invalidate_model_files():
+    """Force the next get_model_files() to rescan, e.g. after retraining"""
+    global _model_files_cache
+    _model_files_cache = (0, [], None)
+
 
 @cron_bp.route('/cron/retrain', methods=['POST'])
 def cron_retrain_models():
     """
     Triggered by Cloudflare Worker cron weekly (Sunday 2 AM)
     Retrains models with latest data
+
+    Training runs in the background; responds 202 with the job id.
     """
     try:
         logger.info("=" * 60)
         logger.info("[CRON RETRAIN] Weekly retraining triggered")
         logger.info("=" * 60)
 
+        # One clock read serves the log line and the response
+        now_iso = datetime.now().isoformat()
+
         # Get trigger info
         data = request.get_json() or {}
         trigger_source = data.get('trigger', 'unknown')
-        timestamp = data.get('timestamp', datetime.now().isoformat())
+        timestamp = data.get('timestamp', now_iso)
 
         logger.info(f"Trigger source: {trigger_source}")
         logger.info(f"Timestamp: {timestamp}")
 
         # Check if we have enough data
-        from sqlalchemy import func
-        from data.database import GasPrice, OnChainFeatures
-        session = db._get_session()
+        gas_count = db.count_rows(GasPrice)
+        onchain_count = db.count_rows(OnChainFeatures)
 
-        try:
-            gas_count = session.query(func.count()).select_from(GasPrice).scalar()
-            onchain_count = session.query(func.count()).select_from(OnChainFeatures).scalar()
+        logger.info(f"Data available: {gas_count} gas prices, {onchain_count} onchain features")
 
-            logger.info(f"Data available: {gas_count} gas prices, {onchain_count} onchain features")
+        # Need minimum data for retraining; exact, but stops at the 1000th row
+        if not db.has_at_least(GasPrice, 1000):
+            # Report the exact count (cheap below 1000 rows), not the estimate
+            with db.Session() as session:
+                gas_count = session.execute(select(func.count()).select_from(GasPrice)).scalar()
+            logger.warning(f"Insufficient gas price data: {gas_count} < 1000")
+            return jsonify({
+                "success": False,
+                "message": "Insufficient data for retraining",
+                "gas_prices": gas_count,
+                "required": 1000
+            }), 400
+
+        # Run training script
+        script_path = os.path.join(
+            os.path.dirname(os.path.dirname(__file__)),
+            'scripts',
+            'train_with_current_data.py'
+        )
+
+        # Train in the background; the job status is at /retraining/jobs/<job_id>
+        job, accepted = retrain_jobs.submit_script(
+            script_path,
+            timeout=1800,  # 30 minute timeout
+            trigger=f"cron:{trigger_source}",
+            on_finish=invalidate_model_files
+        )
+        if not accepted:
+            logger.warning("Retraining already in progress - trigger ignored")
+            return jsonify({
+                "success": False,
+                "message": "Retraining already in progress",
+                "job_id": job['job_id'] if job else None
+            }), 409
 
-            # Need minimum data for retraining
-            if gas_count < 1000:
-                logger.warning(f"Insufficient gas price data: {gas_count} < 1000")
-                return jsonify({
-                    "success": False,
-                    "message": "Insufficient data for retraining",
-                    "gas_prices": gas_count,
-                    "required": 1000
-                }), 400
-
-            # Run training script
-            script_path = os.path.join(
-                os.path.dirname(os.path.dirname(__file__)),
-                'scripts',
-                'train_with_current_data.py'
-            )
-
-            logger.info(f"Running training script: {script_path}")
-
-            result = subprocess.run(
-                ['python3', script_path],
-                capture_output=True,
-                text=True,
-                timeout=1800  # 30 minute timeout
-            )
-
-            if result.returncode == 0:
-                logger.info("✅ Model retraining completed successfully")
-                logger.info(f"Output: {result.stdout[-500:]}")  # Last 500 chars
-
-                return jsonify({
-                    "success": True,
-                    "message": "Models retrained successfully",
-                    "timestamp": datetime.now().isoformat(),
-                    "data_used": {
-                        "gas_prices": gas_count,
-                        "onchain_features": onchain_count
-                    }
-                })
-            else:
-                logger.error("❌ Model retraining failed")
-                logger.error(f"Error: {result.stderr}")
-
-                return jsonify({
-                    "success": False,
-                    "message": "Retraining failed",
-                    "error": result.stderr[-500:]  # Last 500 chars
-                }), 500
-
-        finally:
-            session.close()
-
-    except subprocess.TimeoutExpired:
-        logger.error("❌ Retraining timed out (30 minutes)")
         return jsonify({
-            "success": False,
-            "message": "Retraining timed out"
-        }), 500
+            "success": True,
+            "message": "Retraining started",
+            "job_id": job['job_id'],
+            "timestamp": now_iso,
+            "data_used": {
+                "gas_prices": gas_count,
+                "onchain_features": onchain_count
+            }
+        }), 202
 
     except Exception as e:
         logger.error(f"❌ Error during retraining: {e}")
@@ -127,8 +187,8 @@ def cron_health_check():
     try:
         logger.info("[CRON HEALTH] Running model health check")
 
-        # Use the existing prediction validator
-        health = validator.check_model_health(threshold_mae=0.01)
+        # Use the existing prediction validator, shared with /model-stats
+        health = get_health()
 
         if health['healthy']:
             logger.info("✅ Model health: GOOD")
@@ -167,54 +227,40 @@ def model_stats():
     Returns R², MAE, directional accuracy, data collection status, and last trained time
     """
     try:
-        session = db._get_session()
+        # Get data collection stats
+        gas_count = db.count_rows(GasPrice)
+        onchain_count = db.count_rows(OnChainFeatures)
+
+        # Get last training time from model files
+        _, last_trained = get_model_files()
+        if last_trained:
+            last_trained = datetime.fromtimestamp(last_trained)
+
+        # Get actual model performance from prediction validator
+        # This uses real predictions vs actuals from the database
+        health_check = get_health()
+
+        # Build performance metrics from validator results
+        performance = {}
+        for horizon in ['1h', '4h', '24h']:
+            horizon_metrics = health_check.get('metrics', {}).get(horizon, {})
+
+            performance[horizon] = {
+                "r2": float(horizon_metrics.get('r2', 0)),
+                "mae": float(horizon_metrics.get('mae', 0)),
+                "directional_accuracy": float(horizon_metrics.get('directional_accuracy', 0))
+            }
 
-        try:
-            # Get data collection stats
-            from sqlalchemy import func
-            from data.database import GasPrice, OnChainFeatures
-            gas_count = session.query(func.count()).select_from(GasPrice).scalar()
-            onchain_count = session.query(func.count()).select_from(OnChainFeatures).scalar()
-
-            # Get last training time from model files
-            import glob
-            model_files = glob.glob('models/saved_models/model_*.pkl')
-            if not model_files:
-                model_files = glob.glob('backend/models/saved_models/model_*.pkl')
-
-            last_trained = None
-            if model_files:
-                last_trained = max(os.path.getmtime(f) for f in model_files)
-                last_trained = datetime.fromtimestamp(last_trained)
-
-            # Get actual model performance from prediction validator
-            # This uses real predictions vs actuals from the database
-            health_check = validator.check_model_health(threshold_mae=0.01)
-
-            # Build performance metrics from validator results
-            performance = {}
-            for horizon in ['1h', '4h', '24h']:
-                horizon_metrics = health_check.get('metrics', {}).get(horizon, {})
-
-                performance[horizon] = {
-                    "r2": float(horizon_metrics.get('r2', 0)),
-                    "mae": float(horizon_metrics.get('mae', 0)),
-                    "directional_accuracy": float(horizon_metrics.get('directional_accuracy', 0))
-                }
-
-            return jsonify({
-                "performance": performance,
-                "data_collection": {
-                    "gas_prices": gas_count,
-                    "onchain_features": onchain_count
-                },
-                "last_trained": last_trained.isoformat() if last_trained else None,
-                "healthy": health_check.get('healthy', True),
-                "alerts": health_check.get('alerts', [])
-            })
-
-        finally:
-            session.close()
+        return jsonify({
+            "performance": performance,
+            "data_collection": {
+                "gas_prices": gas_count,
+                "onchain_features": onchain_count
+            },
+            "last_trained": last_trained.isoformat() if last_trained else None,
+            "healthy": health_check.get('healthy', True),
+            "alerts": health_check.get('alerts', [])
+        })
 
     except Exception as e:
         logger.error(f"Error getting model stats: {e}")
@@ -238,36 +284,26 @@ def cron_status():
     Shows last retrain, last health check, etc.
     """
     try:
-        session = db._get_session()
-
-        try:
+        with db.Session() as session:
             # Get data collection stats
-            from sqlalchemy import func
-            from data.database import GasPrice, OnChainFeatures
-            gas_count = session.query(func.count()).select_from(GasPrice).scalar()
-            onchain_count = session.query(func.count()).select_from(OnChainFeatures).scalar()
-
-            # Get latest gas price timestamp
-            latest_gas = session.query(func.max(GasPrice.timestamp)).scalar()
+            gas_count = db.count_rows(GasPrice)
+            onchain_count = db.count_rows(OnChainFeatures)
 
-            # Get latest onchain feature timestamp
-            latest_onchain = session.query(func.max(OnChainFeatures.timestamp)).scalar()
+            # Get latest gas price and onchain feature timestamps
+            latest_gas, latest_onchain = session.execute(_LATEST_TIMESTAMPS_STMT).one()
 
             # Check model files
-            import glob
-            model_files = glob.glob('models/saved_models/model_*.pkl')
-            if not model_files:
-                model_files = glob.glob('backend/models/saved_models/model_*.pkl')
-
-            last_retrain = None
-            if model_files:
-                # Get most recent model file modification time
-                last_retrain = max(os.path.getmtime(f) for f in model_files)
+            model_files, last_retrain = get_model_files()
+            if last_retrain:
+                # Most recent model file modification time
                 last_retrain = datetime.fromtimestamp(last_retrain).isoformat()
 
+            # One clock read for the response timestamp and the freshness check
+            now = datetime.now()
+
             return jsonify({
                 "success": True,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "data_collection": {
                     "gas_prices": gas_count,
                     "onchain_features": onchain_count,
@@ -275,7 +311,7 @@ def cron_status():
                     "latest_onchain_timestamp": latest_onchain.isoformat() if latest_onchain else None,
                     "collection_active": (
                         latest_onchain and
-                        (datetime.now() - latest_onchain).total_seconds() < 300  # Within 5 minutes
+                        (now - latest_onchain).total_seconds() < 300  # Within 5 minutes
                     ) if latest_onchain else False
                 },
                 "models": {
@@ -284,9 +320,6 @@ def cron_status():
                 }
             })
 
-        finally:
-            session.close()
-
     except Exception as e:
         logger.error(f"Error getting cron status: {e}")
         return jsonify({
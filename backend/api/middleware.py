@@ -14,10 +14,17 @@ else:
     # Production: Stricter limits
     default_limits = ["200 per day", "50 per hour"]
 
+# Counters live in Redis when REDIS_URL is set, so limits hold across
+# gunicorn workers; otherwise each process keeps its own in memory.
+# If Redis becomes unreachable, limiting falls back to memory rather
+# than failing requests.
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=default_limits,
-    storage_uri="memory://"
+    storage_uri=Config.REDIS_URL or "memory://",
+    strategy="moving-window",
+    in_memory_fallback_enabled=bool(Config.REDIS_URL),
+    swallow_errors=True
 )
 
 
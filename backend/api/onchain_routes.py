@@ -9,6 +9,7 @@ from utils.onchain_features import OnChainFeatureExtractor, feature_cache
 from utils.logger import logger
 from api.cache import cached
 from datetime import datetime
+import numpy as np
 
 onchain_bp = Blueprint('onchain', __name__)
 extractor = OnChainFeatureExtractor()
@@ -91,9 +92,7 @@ def get_congestion_history():
 
         hours = int(request.args.get('hours', 24))
         db = DatabaseManager()
-        session = db._get_session()
-
-        try:
+        with db.Session() as session:
             cutoff = datetime.now() - timedelta(hours=hours)
 
             features = session.query(OnChainFeatures).filter(
@@ -115,10 +114,11 @@ def get_congestion_history():
                 'congestion_level': _get_congestion_level(f.gas_utilization)
             } for f in features]
 
-            # Calculate summary stats
-            avg_utilization = sum(d['utilization'] for d in congestion_data) / len(congestion_data)
-            max_utilization = max(d['utilization'] for d in congestion_data)
-            high_congestion_periods = sum(1 for d in congestion_data if d['utilization'] > 0.7)
+            # Calculate summary stats in one pass over a utilization array
+            utilization = np.fromiter((f.gas_utilization for f in features), dtype=np.float64, count=len(features))
+            avg_utilization = float(utilization.mean())
+            max_utilization = float(utilization.max())
+            high_congestion_periods = int((utilization > 0.7).sum())
 
             return jsonify({
                 'hours': hours,
@@ -131,9 +131,6 @@ def get_congestion_history():
                 }
             }), 200
 
-        finally:
-            session.close()
-
     except Exception as e:
         logger.error(f"Error getting congestion history: {e}")
         return jsonify({'error': str(e)}), 500
@@ -10,12 +10,49 @@ Endpoints for managing automated model retraining:
 
 from flask import Blueprint, jsonify, request
 from utils.model_retrainer import ModelRetrainer
+from data.database import DatabaseManager, GasPrice
+from sqlalchemy import func, select
+from api.cron_routes import invalidate_model_files
+from services import retrain_jobs
 from utils.logger import logger
 from datetime import datetime
+import json
 import os
+import traceback
 
 retraining_bp = Blueprint('retraining', __name__)
 retrainer = ModelRetrainer()
+db = DatabaseManager()
+
+# Built once so each request reuses SQLAlchemy's compiled-SQL cache entry
+_DATE_RANGE_STMT = select(func.min(GasPrice.timestamp), func.max(GasPrice.timestamp))
+
+# training_metadata.json is rewritten only after training, so the parsed
+# summary is kept until the file's mtime changes
+_metadata_cache = {'mtime': None, 'value': None}
+
+
+def get_last_training():
+    """Summary of training_metadata.json, or None if there is none yet"""
+    metadata_path = f"{retrainer.models_dir}/training_metadata.json"
+    try:
+        mtime = os.stat(metadata_path).st_mtime
+    except FileNotFoundError:
+        return None
+    if mtime == _metadata_cache['mtime']:
+        return _metadata_cache['value']
+
+    with open(metadata_path, 'r') as f:
+        metadata = json.load(f)
+    last_training = {
+        'timestamp': metadata.get('training_timestamp'),
+        'reason': metadata.get('reason'),
+        'models_trained': metadata.get('models_trained', []),
+        'validation_passed': metadata.get('validation_passed', False)
+    }
+    _metadata_cache['mtime'] = mtime
+    _metadata_cache['value'] = last_training
+    return last_training
 
 
 @retraining_bp.route('/retraining/status', methods=['GET'])
@@ -30,19 +67,7 @@ def get_retraining_status():
         should_retrain, reason = retrainer.should_retrain()
 
         # Get last training info
-        metadata_path = f"{retrainer.models_dir}/training_metadata.json"
-        last_training = None
-
-        if os.path.exists(metadata_path):
-            import json
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-                last_training = {
-                    'timestamp': metadata.get('training_timestamp'),
-                    'reason': metadata.get('reason'),
-                    'models_trained': metadata.get('models_trained', []),
-                    'validation_passed': metadata.get('validation_passed', False)
-                }
+        last_training = get_last_training()
 
         return jsonify({
             'should_retrain': should_retrain,
@@ -91,8 +116,14 @@ def trigger_retraining():
         logger.info(f"Manual retraining triggered: model_type={model_type}, force={force}")
 
         # Run retraining in background (for production, use Celery or background worker)
-        # For now, run synchronously
-        results = retrainer.retrain_models(model_type=model_type, force=force)
+        # For now, run synchronously, but never alongside another retraining
+        if not retrain_jobs.try_acquire():
+            return jsonify({'error': 'Retraining already in progress'}), 409
+        try:
+            results = retrainer.retrain_models(model_type=model_type, force=force)
+        finally:
+            retrain_jobs.release()
+        invalidate_model_files()
 
         status_code = 200 if results.get('validation_passed', False) else 500
 
@@ -112,39 +143,12 @@ def get_retraining_history():
         List of past retraining events
     """
     try:
-        # Get all backups (each represents a retraining event)
-        backup_dir = retrainer.backup_dir
-        backups = []
-
-        if os.path.exists(backup_dir):
-            for backup_folder in os.listdir(backup_dir):
-                if backup_folder.startswith('backup_'):
-                    backup_path = f"{backup_dir}/{backup_folder}"
-
-                    # Extract timestamp from folder name
-                    timestamp_str = backup_folder.replace('backup_', '')
-
-                    try:
-                        timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-
-                        # Get backup info
-                        backup_info = {
-                            'timestamp': timestamp.isoformat(),
-                            'backup_path': backup_path,
-                            'files': os.listdir(backup_path) if os.path.isdir(backup_path) else []
-                        }
-
-                        backups.append(backup_info)
-
-                    except ValueError:
-                        continue
-
-        # Sort by timestamp (newest first)
-        backups.sort(key=lambda x: x['timestamp'], reverse=True)
+        # Each backup represents a retraining event; read from the backup index
+        total_backups, backups = retrainer.get_backup_history(limit=20)
 
         return jsonify({
-            'total_backups': len(backups),
-            'backups': backups[:20]  # Return last 20
+            'total_backups': total_backups,
+            'backups': backups  # Newest first, last 20
         }), 200
 
     except Exception as e:
@@ -191,6 +195,7 @@ def rollback_models():
 
         # Restore models
         retrainer.restore_models(backup_path)
+        invalidate_model_files()
 
         return jsonify({
             'success': True,
@@ -212,40 +217,31 @@ def check_training_data():
         Data availability status
     """
     try:
-        from data.database import GasPrice, DatabaseManager
+        total_records = db.count_rows(GasPrice)
 
-        db = DatabaseManager()
-        session = db._get_session()
+        # Get date range in one aggregate; both ends come off the timestamp index
+        with db.Session() as session:
+            oldest, newest = session.execute(_DATE_RANGE_STMT).one()
 
-        try:
-            total_records = session.query(GasPrice).count()
-
-            # Get date range
-            oldest = session.query(GasPrice).order_by(GasPrice.timestamp.asc()).first()
-            newest = session.query(GasPrice).order_by(GasPrice.timestamp.desc()).first()
-
-            if oldest and newest:
-                date_range_days = (newest.timestamp - oldest.timestamp).days
-            else:
-                date_range_days = 0
+        if oldest and newest:
+            date_range_days = (newest - oldest).days
+        else:
+            date_range_days = 0
 
-            # Recommended: At least 30 days of data for quality predictions
-            recommended_days = 30
-            sufficient = date_range_days >= recommended_days
+        # Recommended: At least 30 days of data for quality predictions
+        recommended_days = 30
+        sufficient = date_range_days >= recommended_days
 
-            return jsonify({
-                'total_records': total_records,
-                'date_range_days': date_range_days,
-                'oldest_timestamp': oldest.timestamp.isoformat() if oldest else None,
-                'newest_timestamp': newest.timestamp.isoformat() if newest else None,
-                'recommended_days': recommended_days,
-                'sufficient_data': sufficient,
-                'readiness': 'ready' if sufficient else 'collecting',
-                'progress_percent': min(100, (date_range_days / recommended_days) * 100)
-            }), 200
-
-        finally:
-            session.close()
+        return jsonify({
+            'total_records': total_records,
+            'date_range_days': date_range_days,
+            'oldest_timestamp': oldest.isoformat() if oldest else None,
+            'newest_timestamp': newest.isoformat() if newest else None,
+            'recommended_days': recommended_days,
+            'sufficient_data': sufficient,
+            'readiness': 'ready' if sufficient else 'collecting',
+            'progress_percent': min(100, (date_range_days / recommended_days) * 100)
+        }), 200
 
     except Exception as e:
         logger.error(f"Error checking training data: {e}")
@@ -257,64 +253,61 @@ def trigger_simple_retraining():
     """
     Trigger simple model retraining using the retrain_models_simple.py script
 
-    This runs synchronously and may take 3-5 minutes. For async execution,
-    consider using a background task queue.
+    Training takes 3-5 minutes, so it runs in the background and this
+    responds 202 with a job id; poll /retraining/jobs/<job_id> for the result.
 
     Returns:
-        Training results or error
+        Job id or error
     """
     try:
-        import subprocess
-        import sys
-
         logger.info("Starting simple model retraining...")
 
-        # Run the retraining script
         # Get absolute path to the script
-        import os
         current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         script_path = os.path.join(current_dir, "scripts", "retrain_models_simple.py")
 
         logger.info(f"Script path: {script_path}")
         logger.info(f"Script exists: {os.path.exists(script_path)}")
 
-        # Execute the script and capture output
-        result = subprocess.run(
-            [sys.executable, script_path],
-            capture_output=True,
-            text=True,
+        job, accepted = retrain_jobs.submit_script(
+            script_path,
             timeout=600,  # 10 minute timeout
-            cwd=current_dir  # Set working directory to backend/
+            trigger='manual:simple',
+            cwd=current_dir,  # Set working directory to backend/
+            on_finish=invalidate_model_files
         )
-
-        if result.returncode == 0:
-            logger.info("Retraining completed successfully")
-            return jsonify({
-                'status': 'success',
-                'message': 'Models retrained successfully',
-                'output': result.stdout,
-                'timestamp': datetime.now().isoformat()
-            }), 200
-        else:
-            logger.error(f"Retraining failed: {result.stderr}")
+        if not accepted:
             return jsonify({
                 'status': 'error',
-                'message': 'Retraining failed',
-                'error': result.stderr,
-                'output': result.stdout
-            }), 500
+                'message': 'Retraining already in progress',
+                'job_id': job['job_id'] if job else None
+            }), 409
 
-    except subprocess.TimeoutExpired:
-        logger.error("Retraining timed out")
         return jsonify({
-            'status': 'error',
-            'message': 'Retraining timed out after 10 minutes'
-        }), 500
+            'status': 'accepted',
+            'message': 'Retraining started',
+            'job_id': job['job_id'],
+            'timestamp': datetime.now().isoformat()
+        }), 202
+
     except Exception as e:
         logger.error(f"Error during simple retraining: {e}")
-        import traceback
         return jsonify({
             'status': 'error',
             'message': str(e),
             'traceback': traceback.format_exc()
         }), 500
+
+
+@retraining_bp.route('/retraining/jobs/<job_id>', methods=['GET'])
+def get_retraining_job(job_id):
+    """
+    Status of a background retraining job
+
+    Returns:
+        Job status: queued, running, succeeded, failed or timeout
+    """
+    job = retrain_jobs.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job_id'}), 404
+    return jsonify(job), 200
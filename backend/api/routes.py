@@ -3,7 +3,7 @@ API Routes
 All API endpoints for the gas price prediction system
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from data.collector import BaseGasCollector
 from data.database import DatabaseManager
 from models.feature_engineering import GasFeatureEngineer
@@ -12,9 +12,36 @@ from utils.base_scanner import BaseScanner
 from utils.logger import logger
 from utils.prediction_validator import PredictionValidator
 from api.cache import cached, clear_cache
+from models.advanced_features import create_advanced_features
+from config import Config
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+import joblib
+import json
+import os
+import requests
+import time
 import traceback
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import pandas as pd
+
+# Spike-detection predictor; /predictions falls back to the legacy models without it
+try:
+    from models.hybrid_predictor import hybrid_predictor
+    HYBRID_AVAILABLE = True
+except ImportError:
+    hybrid_predictor = None
+    HYBRID_AVAILABLE = False
+
+# Optional ONNX Runtime inference for models exported by scripts/convert_to_onnx.py
+try:
+    import onnxruntime
+    ONNX_AVAILABLE = True
+except ImportError:
+    onnxruntime = None
+    ONNX_AVAILABLE = False
 
 
 api_bp = Blueprint('api', __name__)
@@ -26,15 +53,34 @@ engineer = GasFeatureEngineer()
 scanner = BaseScanner()
 validator = PredictionValidator()
 
+# One worker per horizon; sklearn/numpy release the GIL inside predict
+_predict_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix='predict')
+
+# Keep-alive connection pool for BaseScan lookups; opens no connection until
+# first use, so it is safe to create before gunicorn forks workers
+_basescan_session = requests.Session()
+
+# Fallback prediction per horizon as a multiple of the current gas price,
+# used when no model prediction is available
+FALLBACK_MULTIPLIERS = {'1h': 1.05, '4h': 1.1, '24h': 1.15}
+
+# Longest window /historical serves (30 days); larger requests are clamped
+MAX_HISTORY_HOURS = 720
+
+# Prediction bookkeeping writes, kept off the request thread; queued writes
+# still finish at interpreter exit (concurrent.futures joins its workers)
+_writer_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='prediction-writer')
+
 
 # Load trained models
+# Loaded once at import: with gunicorn's preload the master loads them and
+# forked workers share the pages copy-on-write (the arrays are also mmapped).
+# Request code must treat models/scalers/feature_names as read-only - any
+# write would copy pages into every worker and diverge their state.
 models = {}
 scalers = {}
 feature_names = {}
 try:
-    import joblib
-    import os
-    
     for horizon in ['1h', '4h', '24h']:
         # Try both paths to support different working directories
         model_path = f'models/saved_models/model_{horizon}.pkl'
@@ -46,7 +92,9 @@ try:
             scaler_path = f'backend/models/saved_models/scaler_{horizon}.pkl'
         
         if os.path.exists(model_path):
-            model_data = joblib.load(model_path)
+            # Memory-mapped so forked workers share the arrays via the page cache;
+            # writers replace these files rather than rewriting them in place
+            model_data = joblib.load(model_path, mmap_mode='r')
             
             # Handle both old and new model formats
             if isinstance(model_data, dict):
@@ -68,7 +116,7 @@ try:
                 elif 'scaler' in model_data:
                     scalers[horizon] = model_data['scaler']
                 elif os.path.exists(scaler_path):
-                    scalers[horizon] = joblib.load(scaler_path)
+                    scalers[horizon] = joblib.load(scaler_path, mmap_mode='r')
                 
                 # Load feature names if available
                 if 'feature_names' in model_data:
@@ -80,6 +128,17 @@ try:
                     'model_name': 'Legacy',
                     'metrics': {}
                 }
+
+            # Serve from an ONNX export if it was made from this pickle (not older than it)
+            onnx_path = model_path[:-len('.pkl')] + '.onnx'
+            if ONNX_AVAILABLE and os.path.exists(onnx_path) and os.path.getmtime(onnx_path) >= os.path.getmtime(model_path):
+                try:
+                    models[horizon]['onnx_session'] = onnxruntime.InferenceSession(
+                        onnx_path, providers=['CPUExecutionProvider']
+                    )
+                    logger.info(f"✅ Using ONNX export for {horizon}")
+                except Exception as e:
+                    logger.warning(f"Could not load ONNX model {onnx_path}: {e}")
         else:
             # Try old loading method
             try:
@@ -93,7 +152,7 @@ try:
         feature_names_path = 'backend/models/saved_models/feature_names.pkl'
 
     if os.path.exists(feature_names_path):
-        global_feature_names = joblib.load(feature_names_path)
+        global_feature_names = joblib.load(feature_names_path, mmap_mode='r')
         for horizon in ['1h', '4h', '24h']:
             if horizon not in feature_names:
                 feature_names[horizon] = global_feature_names
@@ -103,26 +162,275 @@ try:
         logger.info(f"✅ Loaded {len(scalers)} scalers")
 except Exception as e:
     logger.warning(f"⚠️  Could not load models: {e}")
-    import traceback
     logger.warning(traceback.format_exc())
 
 
+def _parse_timestamps(values):
+    """Parse ISO timestamps in one vectorized pass; unparseable ones become now"""
+    return pd.to_datetime(pd.Series(values, dtype=object), format='ISO8601', errors='coerce').fillna(pd.Timestamp.now())
+
+
+def _float_column(records, key):
+    """One numeric field of a list of records as a float64 array, None as 0"""
+    return np.fromiter((r.get(key) or 0 for r in records), dtype=np.float64, count=len(records))
+
+
+def _history_frame(records, gas_column='gas'):
+    """get_historical_data() records as a predictor input DataFrame, built column by column"""
+    return pd.DataFrame({
+        'timestamp': _parse_timestamps([r.get('timestamp', '') for r in records]),
+        gas_column: _float_column(records, 'gwei'),
+        'base_fee': _float_column(records, 'baseFee'),
+        'priority_fee': _float_column(records, 'priorityFee')
+    })
+
+
+def _graph_history(records):
+    """Last 100 records as {'time': 'HH:MM', 'gwei'} points for the chart"""
+    records = records[-100:]
+    return pd.DataFrame({
+        'time': _parse_timestamps([r.get('timestamp', '') for r in records]).dt.strftime('%H:%M'),
+        'gwei': _float_column(records, 'gwei').round(4)
+    }).to_dict(orient='records')
+
+
+@lru_cache(maxsize=1)
+def _engineered_feature_names():
+    """
+    Feature columns GasFeatureEngineer produces, from a one-row sample
+
+    The column set does not depend on the values, so the sample frame and
+    its three feature passes are built once per process.
+    """
+    sample_df = pd.DataFrame([{
+        'timestamp': datetime.now(),
+        'gas': 0.0,
+        'base_fee': 0,
+        'priority_fee': 0,
+        'block_number': 0
+    }])
+    sample_df = engineer._add_time_features(sample_df)
+    sample_df = engineer._add_lag_features(sample_df)
+    sample_df = engineer._add_rolling_features(sample_df)
+    return tuple(engineer.get_feature_columns(sample_df))
+
+
+def _predict_first(model_data, X):
+    """First-row prediction, through ONNX Runtime when a current export was loaded"""
+    session = model_data.get('onnx_session')
+    if session is not None:
+        try:
+            return session.run(None, {'X': np.asarray(X, dtype=np.float32)})[0].ravel()[0]
+        except Exception as e:
+            logger.warning(f"ONNX inference failed, using the pickled model: {e}")
+    return model_data['model'].predict(X)[0]
+
+
+# Positions of each horizon's expected features in the engineered frame, per
+# column layout: (index array with -1 for missing, names of the missing ones)
+_feature_order = {}
+
+
+def _select_features(horizon, features, expected_features):
+    """
+    features as an array in expected_features order, zeros for missing columns
+
+    The column lookup runs once per horizon and column layout; afterwards the
+    selection is a positional gather.
+
+    Returns:
+        (array, missing feature names)
+    """
+    key = (horizon, tuple(features.columns))
+    order = _feature_order.get(key)
+    if order is None:
+        position = {name: i for i, name in enumerate(features.columns)}
+        index = np.array([position.get(f, -1) for f in expected_features], dtype=np.intp)
+        order = (index, [f for f, i in zip(expected_features, index) if i < 0])
+        _feature_order[key] = order
+
+    index, missing = order
+    present = index >= 0
+    out = np.zeros((len(features), len(index)))
+    out[:, present] = features.iloc[:, index[present]].to_numpy(dtype=np.float64)
+    return out, missing
+
+
+def _raw_prediction(horizon, features, current):
+    """
+    One horizon's raw model output for the first feature row
+
+    Selects and scales the features the model was trained on; feature
+    mismatches fall back to a fixed multiple of the current gas price.
+    """
+    model_data = models[horizon]
+
+    # Scale features if scaler is available
+    features_to_predict = features
+    if horizon in scalers:
+        try:
+            # Get expected features from model_data (these are already SELECTED features)
+            expected_features = model_data.get('feature_names', [])
+            if not expected_features and horizon in feature_names:
+                expected_features = feature_names[horizon]
+
+            if expected_features and len(expected_features) > 0:
+                # Select and order features (model expects these specific features),
+                # missing features as zeros
+                # Note: feature_selector was already applied during training, so these are the selected features
+                features_to_predict, missing_features = _select_features(horizon, features, expected_features)
+                if missing_features:
+                    logger.warning(f"Missing features for {horizon}: {missing_features[:5]}...")
+
+                # Scalers fitted on a DataFrame check column names
+                if hasattr(scalers[horizon], 'feature_names_in_'):
+                    features_to_predict = pd.DataFrame(features_to_predict, columns=expected_features)
+                logger.debug(f"Selected {len(expected_features)} features for {horizon}")
+            else:
+                features_to_predict = features
+                logger.warning(f"No expected features for {horizon}, using all {len(features.columns)} features")
+
+            # Scale features
+            features_scaled = scalers[horizon].transform(features_to_predict)
+            pred = _predict_first(model_data, features_scaled)
+        except ValueError as ve:
+            # Feature mismatch - use simple fallback
+            logger.warning(f"Feature mismatch for {horizon}: {ve}. Using fallback prediction")
+            pred = current['current_gas'] * FALLBACK_MULTIPLIERS[horizon]
+        except Exception as e:
+            logger.warning(f"Prediction failed for {horizon}: {e}, using fallback")
+            pred = current['current_gas'] * FALLBACK_MULTIPLIERS[horizon]
+    else:
+        try:
+            pred = _predict_first(model_data, features)
+        except ValueError as ve:
+            # Feature mismatch - use simple fallback
+            logger.warning(f"Feature mismatch for {horizon}: {ve}. Using fallback prediction")
+            pred = current['current_gas'] * FALLBACK_MULTIPLIERS[horizon]
+
+    return pred
+
+def _record_predictions(records):
+    """
+    Save a response's served predictions and log them for validation (on the writer pool)
+
+    records are (horizon, predicted_gas, model_version); all horizons go in
+    one transaction per table instead of one per row.
+    """
+    if not records:
+        return
+    try:
+        # Model outputs may be numpy scalars (float32 from ONNX), which the DB driver rejects
+        records = [(horizon, float(predicted_gas), model_version) for horizon, predicted_gas, model_version in records]
+
+        # Save predictions (old format for compatibility)
+        db.save_predictions(records)
+
+        # Log predictions for validation
+        now = datetime.now()
+        horizon_hours = {'1h': 1, '4h': 4, '24h': 24}
+        validator.log_predictions([
+            (horizon, predicted_gas, now + timedelta(hours=horizon_hours[horizon]), model_version)
+            for horizon, predicted_gas, model_version in records
+        ])
+    except Exception as e:
+        logger.error(f"Could not record predictions: {e}")
+
+
+def _external_features(gas_price, window=12):
+    """
+    External model features for a time-ordered gas price array
+
+    Matches the pandas formulation used in training (rolling std/mean over
+    `window` rows with min_periods=1, |diff|, pct_change(12/48), rows since
+    the last 90th-percentile spike) but computes all of it with a handful of
+    array operations instead of one pandas pass per feature.
+    """
+    g = np.asarray(gas_price, dtype=np.float64)
+    n = len(g)
+    idx = np.arange(n)
+
+    # Trailing windows as rows of a NaN-padded view; the first rows use what
+    # they have. Variance is taken around each window's own mean (as pandas
+    # does), and windows of identical values get exactly 0, as in pandas
+    start = np.maximum(idx + 1 - window, 0)
+    count = idx + 1 - start
+    volatility = np.zeros(n)
+    mean = g.copy()
+    if n > 0:
+        windows = sliding_window_view(np.concatenate((np.full(window - 1, np.nan), g)), window)
+        mean = np.nanmean(windows, axis=1)
+        deviation = windows - mean[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = np.nansum(deviation * deviation, axis=1) / (count - 1)
+        flat = np.nanmax(windows, axis=1) == np.nanmin(windows, axis=1)
+        volatility = np.where((count > 1) & ~flat, np.sqrt(var), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        congestion = volatility / mean
+    congestion[np.isnan(congestion)] = 0
+
+    gas_change = np.abs(np.diff(g, prepend=g[:1]))
+
+    def momentum(k):
+        out = np.zeros(n)
+        if n > k:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[k:] = g[k:] / g[:-k] - 1
+        return out
+
+    time_since_spike = np.zeros(n, dtype=np.int64)
+    if n > 0:
+        # 90th percentile with linear interpolation (as Series.quantile), from a
+        # partial sort around the two ranks it needs
+        pos = 0.9 * (n - 1)
+        lo = int(pos)
+        hi = min(lo + 1, n - 1)
+        ranked = np.partition(g, [lo, hi])
+        spike_threshold = ranked[lo] + (ranked[hi] - ranked[lo]) * (pos - lo)
+        # Rows since the last spike (row 0 counts as one): distance to the
+        # running max of spike positions
+        time_since_spike = idx - np.maximum.accumulate(np.where(g > spike_threshold, idx, 0))
+
+    return {
+        'estimated_block_time': np.full(n, 2.0),
+        'recent_volatility': volatility,
+        'congestion_score': congestion,
+        'gas_change': gas_change,
+        'time_since_spike': time_since_spike,
+        'momentum_1h': momentum(12),
+        'momentum_4h': momentum(48)
+    }
+
+
+# (epoch second, ISO string) of the last _now_iso() call
+_now_iso_cache = (0, '')
+
+
+def _now_iso():
+    """Current local time as an ISO string, formatted at most once per second"""
+    global _now_iso_cache
+    second = int(time.time())
+    if second != _now_iso_cache[0]:
+        _now_iso_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _now_iso_cache[1]
+
+
 @api_bp.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     # Check if hybrid predictor models are available
     hybrid_models_loaded = False
     try:
-        from models.hybrid_predictor import hybrid_predictor
-        if not hybrid_predictor.loaded:
-            hybrid_predictor.load_models()
-        hybrid_models_loaded = hybrid_predictor.loaded
+        if HYBRID_AVAILABLE:
+            if not hybrid_predictor.loaded:
+                hybrid_predictor.load_models()
+            hybrid_models_loaded = hybrid_predictor.loaded
     except Exception as e:
         logger.warning(f"Could not load hybrid predictor: {e}")
 
     return jsonify({
         'status': 'ok',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': _now_iso(),
         'models_loaded': len(models) > 0 or hybrid_models_loaded,
         'hybrid_predictor_loaded': hybrid_models_loaded,
         'legacy_models_loaded': len(models) > 0,
@@ -131,7 +439,7 @@ def health():
 
 
 @api_bp.route('/current', methods=['GET'])
-@cached(ttl=30)  # Cache for 30 seconds
+@cached(ttl=30, etag=True)  # Cache for 30 seconds
 def current_gas():
     """Get current Base gas price"""
     try:
@@ -153,39 +461,43 @@ def current_gas():
 
 
 @api_bp.route('/historical', methods=['GET'])
-@cached(ttl=300)  # Cache for 5 minutes
+@cached(ttl=300, etag=True)  # Cache for 5 minutes
 def historical():
-    """Get historical gas prices"""
+    """
+    Get historical gas prices
+
+    Query params:
+        hours: window size, default 7 days, at most MAX_HISTORY_HOURS
+        resolution: '1h' or '1d' to get one averaged point per hour/day
+            instead of every collected sample
+    """
     try:
         hours = request.args.get('hours', 168, type=int)  # Default 7 days
+        hours = min(max(hours, 1), MAX_HISTORY_HOURS)
         timeframe = request.args.get('timeframe', 'hourly')  # hourly, daily
-        
-        data = db.get_historical_data(hours=hours)
+        resolution = request.args.get('resolution')
+
+        if resolution is None:
+            data = db.get_historical_data(hours=hours)
+        elif resolution in ('1h', '1d'):
+            data = db.get_historical_buckets(hours=hours, resolution=resolution)
+        else:
+            return jsonify({'error': 'Invalid resolution'}), 400
         
         if not data:
             return jsonify({'error': 'No historical data available'}), 404
         
-        # Format for frontend
-        # data is now a list of dicts, not ORM objects
-        formatted_data = []
-        for d in data:
-            # Handle timestamp - could be string or datetime
-            timestamp = d.get('timestamp', '')
-            if isinstance(timestamp, str):
-                from dateutil import parser
-                try:
-                    timestamp = parser.parse(timestamp)
-                except:
-                    timestamp = datetime.now()
-            elif not isinstance(timestamp, datetime):
-                timestamp = datetime.now()
-            
-            formatted_data.append({
-                'time': timestamp.strftime('%Y-%m-%d %H:%M') if isinstance(timestamp, datetime) else str(timestamp),
-                'gwei': round(d.get('gwei', 0), 4),
-                'baseFee': round(d.get('baseFee', 0), 4),
-                'priorityFee': round(d.get('priorityFee', 0), 4)
-            })
+        # Format for frontend: columns are converted in bulk, then zipped
+        # into records (much cheaper than DataFrame.to_dict on large windows)
+        formatted_data = [
+            {'time': time_str, 'gwei': gwei, 'baseFee': base_fee, 'priorityFee': priority_fee}
+            for time_str, gwei, base_fee, priority_fee in zip(
+                _parse_timestamps([d.get('timestamp', '') for d in data]).dt.strftime('%Y-%m-%d %H:%M').tolist(),
+                _float_column(data, 'gwei').round(4).tolist(),
+                _float_column(data, 'baseFee').round(4).tolist(),
+                _float_column(data, 'priorityFee').round(4).tolist()
+            )
+        ]
         
         logger.info(f"Returned {len(formatted_data)} historical records")
         return jsonify({
@@ -200,43 +512,23 @@ def historical():
 
 
 @api_bp.route('/predictions', methods=['GET'])
-@cached(ttl=60)  # Cache for 1 minute
+@cached(ttl=60, etag=True)  # Cache for 1 minute
 def get_predictions():
     """Get ML-powered gas price predictions using hybrid spike detection"""
     try:
         # Get current gas
         current = collector.get_current_gas()
 
+        # Recent history, fetched and parsed once for every predictor below
+        recent_data = db.get_historical_data(hours=48)
+        recent_frame = _history_frame(recent_data)
+
         # Try hybrid predictor first (spike detection + classification)
         try:
-            from models.hybrid_predictor import hybrid_predictor
-            import pandas as pd
-            from dateutil import parser
-
-            # Get recent data for hybrid predictor (needs at least 50 points)
-            recent_data = db.get_historical_data(hours=48)
-
-            if len(recent_data) >= 50:
+            # Hybrid predictor needs at least 50 points
+            if HYBRID_AVAILABLE and len(recent_data) >= 50:
                 # Convert to DataFrame format for hybrid predictor
-                recent_df = []
-                for d in recent_data:
-                    timestamp = d.get('timestamp', '')
-                    if isinstance(timestamp, str):
-                        try:
-                            dt = parser.parse(timestamp)
-                        except:
-                            dt = datetime.now()
-                    else:
-                        dt = timestamp if hasattr(timestamp, 'hour') else datetime.now()
-
-                    recent_df.append({
-                        'timestamp': dt,
-                        'gas_price': d.get('gwei', 0) or d.get('current_gas', 0),
-                        'base_fee': d.get('baseFee', 0) or d.get('base_fee', 0),
-                        'priority_fee': d.get('priorityFee', 0) or d.get('priority_fee', 0)
-                    })
-
-                df = pd.DataFrame(recent_df)
+                df = recent_frame.rename(columns={'gas': 'gas_price'})
 
                 # Get hybrid predictions
                 hybrid_preds = hybrid_predictor.predict(df)
@@ -268,22 +560,7 @@ def get_predictions():
                     }]
 
                 # Format historical data for graph
-                historical = []
-                for d in recent_data[-100:]:
-                    timestamp = d.get('timestamp', '')
-                    if isinstance(timestamp, str):
-                        try:
-                            dt = parser.parse(timestamp)
-                            time_str = dt.strftime('%H:%M')
-                        except:
-                            time_str = timestamp[:5] if len(timestamp) > 5 else timestamp
-                    else:
-                        time_str = str(timestamp)[:5]
-
-                    historical.append({
-                        'time': time_str,
-                        'gwei': round(d.get('gwei', 0) or d.get('current_gas', 0), 4)
-                    })
+                historical = _graph_history(recent_data)
 
                 prediction_data['historical'] = historical
 
@@ -298,12 +575,13 @@ def get_predictions():
                         'description': 'Classification-based prediction (Normal/Elevated/Spike)'
                     }
                 })
+            elif not HYBRID_AVAILABLE:
+                logger.warning("Hybrid predictor not available, falling back to legacy models")
             else:
                 logger.warning(f"Not enough data for hybrid predictor: {len(recent_data)} records")
 
         except Exception as e:
             logger.warning(f"Hybrid predictor failed: {e}, falling back to legacy models")
-            import traceback
             logger.warning(traceback.format_exc())
 
         # Fallback to legacy models if hybrid fails
@@ -312,16 +590,12 @@ def get_predictions():
             return jsonify({
                 'current': current,
                 'predictions': {
-                    '1h': [{'time': '1h', 'predictedGwei': current['current_gas'] * 1.05}],
-                    '4h': [{'time': '4h', 'predictedGwei': current['current_gas'] * 1.1}],
-                    '24h': [{'time': '24h', 'predictedGwei': current['current_gas'] * 1.15}],
+                    horizon: [{'time': horizon, 'predictedGwei': current['current_gas'] * multiplier}]
+                    for horizon, multiplier in FALLBACK_MULTIPLIERS.items()
                 },
                 'note': 'Using fallback predictions. Train models for ML predictions.'
             })
         
-        # Get recent historical data
-        recent_data = db.get_historical_data(hours=48)
-
         if len(recent_data) < 100:
             logger.warning(f"Not enough data: {len(recent_data)} records")
             return jsonify({'error': 'Not enough historical data'}), 500
@@ -329,67 +603,34 @@ def get_predictions():
         # Wrap entire ML prediction pipeline in try-catch for graceful fallback
         try:
             # Prepare features - recent_data is now a list of dicts
-            # Convert to DataFrame format with proper datetime
-            import pandas as pd
-            from dateutil import parser
-
-            recent_df = []
-            for d in recent_data:
-                timestamp = d.get('timestamp', '')
-                # Parse timestamp string to datetime
-                if isinstance(timestamp, str):
-                    try:
-                        dt = parser.parse(timestamp)
-                    except:
-                        dt = datetime.now()
-                else:
-                    dt = timestamp if hasattr(timestamp, 'hour') else datetime.now()
-
-                recent_df.append({
-                    'timestamp': dt,
-                    'gas': d.get('gwei', 0) or d.get('current_gas', 0),
-                    'base_fee': d.get('baseFee', 0) or d.get('base_fee', 0),
-                    'priority_fee': d.get('priorityFee', 0) or d.get('priority_fee', 0),
-                    'block_number': 0  # Not in dict format
-                })
+            df_recent = recent_frame.assign(block_number=0)  # Not in dict format
 
-            # Convert to DataFrame for feature engineering
-            df_recent = pd.DataFrame(recent_df)
+            # Feature engineering reads gas_price
             if 'gas' in df_recent.columns:
                 df_recent['gas_price'] = df_recent['gas']
 
             # Create advanced features
-            from models.advanced_features import create_advanced_features
             features, _ = create_advanced_features(df_recent)
 
-            # Add external features (same as training)
-            df_recent['timestamp'] = pd.to_datetime(df_recent['timestamp'], format='mixed', errors='coerce')
+            # Add external features (same as training); _history_frame already
+            # parsed the timestamps to datetime64, so only the order is fixed up
             df_recent = df_recent.sort_values('timestamp').reset_index(drop=True)
 
             # Add external features
-            df_recent['estimated_block_time'] = 2.0
-            df_recent['recent_volatility'] = df_recent['gas_price'].rolling(window=12, min_periods=1).std().fillna(0)
-            df_recent['congestion_score'] = (df_recent['recent_volatility'] / df_recent['gas_price'].rolling(window=12, min_periods=1).mean()).fillna(0)
-            df_recent['gas_change'] = df_recent['gas_price'].diff().abs().fillna(0)
-            df_recent['time_since_spike'] = 0
-            if len(df_recent) > 0:
-                spike_threshold = df_recent['gas_price'].quantile(0.9) if len(df_recent) > 1 else df_recent['gas_price'].iloc[0]
-                for i in range(1, len(df_recent)):
-                    if df_recent.iloc[i]['gas_price'] > spike_threshold:
-                        df_recent.iloc[i, df_recent.columns.get_loc('time_since_spike')] = 0
-                    else:
-                        df_recent.iloc[i, df_recent.columns.get_loc('time_since_spike')] = df_recent.iloc[i-1, df_recent.columns.get_loc('time_since_spike')] + 1
-            df_recent['momentum_1h'] = df_recent['gas_price'].pct_change(12).fillna(0)
-            df_recent['momentum_4h'] = df_recent['gas_price'].pct_change(48).fillna(0)
+            external = _external_features(df_recent['gas_price'].to_numpy())
 
-            # Merge external features with features DataFrame
+            # Merge external features with features DataFrame as one block
             external_features = ['estimated_block_time', 'recent_volatility', 'congestion_score',
                                 'time_since_spike', 'momentum_1h', 'momentum_4h']
-            for feat in external_features:
-                if feat in df_recent.columns:
-                    features[feat] = df_recent[feat].values[:len(features)]
+            features = pd.concat([
+                features.drop(columns=external_features, errors='ignore'),
+                pd.DataFrame({feat: external[feat][:len(features)] for feat in external_features}, index=features.index)
+            ], axis=1)
 
-            features = features.fillna(0)
+            # Every model call below reads only the first row's prediction ([0]), so
+            # predict on that row alone instead of the whole 48h window, and only
+            # fill that row's gaps (fillna returns a new frame, no extra copy)
+            features = features.iloc[:1].fillna(0)
 
             # Try to use ensemble predictor first
             use_ensemble = False
@@ -404,6 +645,17 @@ def get_predictions():
             # Make predictions with or without ensemble
             prediction_data = {}
             model_info = {}
+            # (horizon, prediction, model version) to save once the response is built
+            served = []
+
+            # Standard models for all horizons at once, one pool thread each
+            raw_preds = {}
+            if not use_ensemble:
+                futures = {
+                    horizon: _predict_executor.submit(_raw_prediction, horizon, features, current)
+                    for horizon in ['1h', '4h', '24h'] if horizon in models
+                }
+                raw_preds = {horizon: future.result() for horizon, future in futures.items()}
 
             for horizon in ['1h', '4h', '24h']:
                 if use_ensemble:
@@ -435,22 +687,7 @@ def get_predictions():
                             'avg_confidence': confidence
                         }
 
-                        # Save prediction (old format for compatibility)
-                        db.save_prediction(
-                            horizon=horizon,
-                            predicted_gas=pred_value,
-                            model_version='ensemble'
-                        )
-
-                        # Log prediction for validation
-                        horizon_hours = {'1h': 1, '4h': 4, '24h': 24}[horizon]
-                        target_time = datetime.now() + timedelta(hours=horizon_hours)
-                        validator.log_prediction(
-                            horizon=horizon,
-                            predicted_gas=pred_value,
-                            target_time=target_time,
-                            model_version='ensemble'
-                        )
+                        served.append((horizon, pred_value, 'ensemble'))
                     except Exception as e:
                         logger.warning(f"Ensemble prediction failed for {horizon}: {e}, falling back to standard")
                         use_ensemble = False
@@ -458,53 +695,9 @@ def get_predictions():
                 if not use_ensemble and horizon in models:
                     # Fallback to standard models
                     model_data = models[horizon]
-                    model = model_data['model']
 
-                    # Scale features if scaler is available
-                    features_to_predict = features
-                    if horizon in scalers:
-                        try:
-                            # Get expected features from model_data (these are already SELECTED features)
-                            expected_features = model_data.get('feature_names', [])
-                            if not expected_features and horizon in feature_names:
-                                expected_features = feature_names[horizon]
-
-                            if expected_features and len(expected_features) > 0:
-                                # Reorder features to match training order
-                                available_features = list(features.columns)
-                                missing_features = [f for f in expected_features if f not in available_features]
-
-                                if missing_features:
-                                    logger.warning(f"Missing features for {horizon}: {missing_features[:5]}...")
-                                    # Add missing features as zeros
-                                    for f in missing_features:
-                                        features[f] = 0
-
-                                # Select and order features (model expects these specific features)
-                                # Note: feature_selector was already applied during training, so these are the selected features
-                                features_to_predict = features[expected_features]
-                                logger.debug(f"Selected {len(features_to_predict.columns)} features for {horizon}")
-                            else:
-                                features_to_predict = features
-                                logger.warning(f"No expected features for {horizon}, using all {len(features.columns)} features")
-
-                            # Scale features
-                            features_scaled = scalers[horizon].transform(features_to_predict)
-                            pred = model.predict(features_scaled)[0]
-                        except ValueError as ve:
-                            # Feature mismatch - use simple fallback
-                            logger.warning(f"Feature mismatch for {horizon}: {ve}. Using fallback prediction")
-                            pred = current['current_gas'] * (1.05 if horizon == '1h' else 1.1 if horizon == '4h' else 1.15)
-                        except Exception as e:
-                            logger.warning(f"Prediction failed for {horizon}: {e}, using fallback")
-                            pred = current['current_gas'] * (1.05 if horizon == '1h' else 1.1 if horizon == '4h' else 1.15)
-                    else:
-                        try:
-                            pred = model.predict(features)[0]
-                        except ValueError as ve:
-                            # Feature mismatch - use simple fallback
-                            logger.warning(f"Feature mismatch for {horizon}: {ve}. Using fallback prediction")
-                            pred = current['current_gas'] * (1.05 if horizon == '1h' else 1.1 if horizon == '4h' else 1.15)
+                    # Raw model output, computed for every horizon before the loop
+                    pred = raw_preds[horizon] if horizon in raw_preds else _raw_prediction(horizon, features, current)
 
                     # Check if model predicts percentage change, absolute price, or log scale
                     predicts_pct_change = model_data.get('predicts_percentage_change', False)
@@ -516,7 +709,7 @@ def get_predictions():
                         try:
                             target_scaler_path = f'backend/models/saved_models/target_scaler_{horizon}.pkl'
                             if os.path.exists(target_scaler_path):
-                                target_scaler = joblib.load(target_scaler_path)
+                                target_scaler = joblib.load(target_scaler_path, mmap_mode='r')
                                 logger.info(f"Loaded target_scaler from {target_scaler_path}")
                         except Exception as e:
                             logger.warning(f"Could not load target_scaler: {e}")
@@ -568,40 +761,13 @@ def get_predictions():
                         'mae': model_data['metrics']['mae']
                     }
 
-                    db.save_prediction(
-                        horizon=horizon,
-                        predicted_gas=pred,
-                        model_version=model_data['model_name']
-                    )
+                    served.append((horizon, pred, model_data['model_name']))
 
-                    # Log prediction for validation
-                    horizon_hours = {'1h': 1, '4h': 4, '24h': 24}[horizon]
-                    target_time = datetime.now() + timedelta(hours=horizon_hours)
-                    validator.log_prediction(
-                        horizon=horizon,
-                        predicted_gas=pred,
-                        target_time=target_time,
-                        model_version=model_data['model_name']
-                    )
+            # Save and log for validation in the background, as one batch
+            _writer_executor.submit(_record_predictions, served)
 
             # Format historical data for graph
-            historical = []
-            for d in recent_data[-100:]:
-                timestamp = d.get('timestamp', '')
-                if isinstance(timestamp, str):
-                    from dateutil import parser
-                    try:
-                        dt = parser.parse(timestamp)
-                        time_str = dt.strftime('%H:%M')
-                    except:
-                        time_str = timestamp[:5] if len(timestamp) > 5 else timestamp
-                else:
-                    time_str = str(timestamp)[:5]
-
-                historical.append({
-                    'time': time_str,
-                    'gwei': round(d.get('gwei', 0) or d.get('current_gas', 0), 4)
-                })
+            historical = _graph_history(recent_data)
 
             prediction_data['historical'] = historical
 
@@ -621,8 +787,7 @@ def get_predictions():
 
             # Simple fallback: slight increases based on horizon
             fallback_predictions = {}
-            for horizon in ['1h', '4h', '24h']:
-                multiplier = 1.05 if horizon == '1h' else 1.1 if horizon == '4h' else 1.15
+            for horizon, multiplier in FALLBACK_MULTIPLIERS.items():
                 pred_value = round(current['current_gas'] * multiplier, 6)
 
                 fallback_predictions[horizon] = [{
@@ -637,23 +802,7 @@ def get_predictions():
                 }]
 
             # Format historical data for graph
-            historical = []
-            for d in recent_data[-100:]:
-                timestamp = d.get('timestamp', '')
-                if isinstance(timestamp, str):
-                    from dateutil import parser
-                    try:
-                        dt = parser.parse(timestamp)
-                        time_str = dt.strftime('%H:%M')
-                    except:
-                        time_str = timestamp[:5] if len(timestamp) > 5 else timestamp
-                else:
-                    time_str = str(timestamp)[:5]
-
-                historical.append({
-                    'time': time_str,
-                    'gwei': round(d.get('gwei', 0) or d.get('current_gas', 0), 4)
-                })
+            historical = _graph_history(recent_data)
 
             fallback_predictions['historical'] = historical
 
@@ -696,27 +845,7 @@ def explain_prediction(horizon):
             return jsonify({'error': 'Not enough historical data'}), 500
         
         # Prepare features
-        import pandas as pd
-        from dateutil import parser
-        
-        recent_df = []
-        for d in recent_data:
-            timestamp = d.get('timestamp', '')
-            if isinstance(timestamp, str):
-                try:
-                    dt = parser.parse(timestamp)
-                except:
-                    dt = datetime.now()
-            else:
-                dt = timestamp if hasattr(timestamp, 'hour') else datetime.now()
-            
-            recent_df.append({
-                'timestamp': dt,
-                'gas': d.get('gwei', 0) or d.get('current_gas', 0),
-                'base_fee': d.get('baseFee', 0) or d.get('base_fee', 0),
-                'priority_fee': d.get('priorityFee', 0) or d.get('priority_fee', 0),
-                'block_number': 0
-            })
+        recent_df = _history_frame(recent_data).assign(block_number=0)
         
         features = engineer.prepare_prediction_features(recent_df)
         
@@ -738,7 +867,6 @@ def explain_prediction(horizon):
         } for h in historical]
         
         # Initialize explainer if needed
-        from models.explainer import initialize_explainer
         current_explainer = explainer
         
         if current_explainer is None:
@@ -747,19 +875,7 @@ def explain_prediction(horizon):
                 feature_names = list(features.columns)
             except:
                 try:
-                    # Create a sample DataFrame to get feature columns
-                    import pandas as pd
-                    sample_df = pd.DataFrame([{
-                        'timestamp': datetime.now(),
-                        'gas': current_gas['current_gas'],
-                        'base_fee': 0,
-                        'priority_fee': 0,
-                        'block_number': 0
-                    }])
-                    sample_df = engineer._add_time_features(sample_df)
-                    sample_df = engineer._add_lag_features(sample_df)
-                    sample_df = engineer._add_rolling_features(sample_df)
-                    feature_names = list(engineer.get_feature_columns(sample_df))
+                    feature_names = list(_engineered_feature_names())
                 except Exception as e:
                     logger.warning(f"Could not get feature names: {e}")
                     # Fallback feature names
@@ -826,27 +942,36 @@ def get_transactions():
         return jsonify({'error': str(e)}), 500
 
 
+def _load_model_stats():
+    """1h metrics from model_stats.json (trained locally), or None without the file"""
+    stats_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'model_stats.json')
+    try:
+        with open(stats_path, 'r') as f:
+            return json.load(f)['model_performance']['1h']
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Could not read model_stats.json: {e}")
+        return None
+
+
+# model_stats.json ships with the deploy and is not rewritten at runtime,
+# so it is parsed once at import rather than on every /accuracy cache miss
+_MODEL_STATS_1H = _load_model_stats()
+
+
 @api_bp.route('/accuracy', methods=['GET'])
 @cached(ttl=3600)  # Cache for 1 hour
 def get_accuracy():
     """Get model accuracy metrics from hardcoded stats (trained locally)"""
     try:
-        from datetime import datetime, timedelta
-        import json
-        import os
-
-        # Load hardcoded stats from model_stats.json (trained locally)
-        stats_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'model_stats.json')
-
-        if os.path.exists(stats_path):
-            with open(stats_path, 'r') as f:
-                model_stats = json.load(f)
-                metrics = model_stats['model_performance']['1h']
-                mae = metrics.get('mae', 0.000275)
-                rmse = metrics.get('rmse', 0.000442)
-                r2 = metrics.get('r2', 0.0709)
-                directional_accuracy = metrics.get('directional_accuracy', 0.5983)
-                logger.info(f"Using hardcoded metrics: R²={r2:.4f}, DA={directional_accuracy:.4f}")
+        if _MODEL_STATS_1H is not None:
+            metrics = _MODEL_STATS_1H
+            mae = metrics.get('mae', 0.000275)
+            rmse = metrics.get('rmse', 0.000442)
+            r2 = metrics.get('r2', 0.0709)
+            directional_accuracy = metrics.get('directional_accuracy', 0.5983)
+            logger.info(f"Using hardcoded metrics: R²={r2:.4f}, DA={directional_accuracy:.4f}")
         else:
             # Fallback hardcoded values from latest local training
             mae = 0.000275
@@ -865,19 +990,18 @@ def get_accuracy():
         historical_data = db.get_historical_data(hours=24)
         
         if historical_data:
-            # Create sample predictions vs actuals
-            for i, data_point in enumerate(historical_data[:24]):  # Last 24 points
-                if i < len(historical_data) - 1:
-                    actual = data_point.get('gwei', 0)
-                    # Simulate prediction (in real app, this would come from stored predictions)
-                    predicted = actual * (1 + np.random.normal(0, 0.05))  # ±5% variation
-                    error = abs(predicted - actual)
-                    recent_predictions.append({
-                        'timestamp': data_point.get('timestamp', datetime.now().isoformat()),
-                        'predicted': round(predicted, 6),
-                        'actual': round(actual, 6),
-                        'error': round(error, 6)
-                    })
+            # Create sample predictions vs actuals for the last 24 points, as columns
+            points = historical_data[:min(24, len(historical_data) - 1)]
+            actual = _float_column(points, 'gwei')
+            # Simulate prediction (in real app, this would come from stored predictions)
+            predicted = actual * (1 + np.random.normal(0, 0.05, size=len(actual)))  # ±5% variation
+            now_iso = datetime.now().isoformat()
+            recent_predictions = pd.DataFrame({
+                'timestamp': [d.get('timestamp', now_iso) for d in points],
+                'predicted': predicted.round(6),
+                'actual': actual.round(6),
+                'error': np.abs(predicted - actual).round(6)
+            }).to_dict(orient='records')
         
         result = {
             'mae': mae,
@@ -912,10 +1036,6 @@ def get_accuracy():
 def get_user_history(address):
     """Get user transaction history and savings analysis"""
     try:
-        import requests
-        from datetime import datetime, timedelta
-        from config import Config
-        
         # BaseScan API endpoint
         basescan_api_key = Config.BASESCAN_API_KEY
         basescan_url = f"https://api.basescan.org/api"
@@ -941,7 +1061,7 @@ def get_user_history(address):
         if basescan_api_key:
             params['apikey'] = basescan_api_key
         
-        response = requests.get(basescan_url, params=params, timeout=10)
+        response = _basescan_session.get(basescan_url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -962,63 +1082,55 @@ def get_user_history(address):
                 'recommendations': default_recommendations
             })
         
-        transactions = data['result']
-        
-        # Filter to last 30 days and Base network
-        recent_transactions = []
-        total_gas_paid = 0
-        potential_savings = 0
-        transaction_times = []
+        transactions = data['result'][:50]  # Limit to 50 most recent
         
         ETH_PRICE = 3000  # USD per ETH
-        
-        for tx in transactions[:50]:  # Limit to 50 most recent
-            tx_timestamp = int(tx.get('timeStamp', 0))
-            tx_date = datetime.fromtimestamp(tx_timestamp)
-            
-            if tx_date < start_date:
-                continue
-            
-            gas_used = int(tx.get('gasUsed', 0))
-            gas_price = int(tx.get('gasPrice', 0))
-            
-            if gas_used == 0 or gas_price == 0:
-                continue
-            
-            # Calculate cost
-            gas_price_gwei = gas_price / 1e9
-            cost_eth = (gas_price * gas_used) / 1e18
-            cost_usd = cost_eth * ETH_PRICE
-            total_gas_paid += cost_usd
-            
-            # Estimate optimal cost (using current best prediction)
-            current_gas = collector.get_current_gas()
-            if current_gas:
-                current_gas_price = current_gas.get('current_gas', 0)
-                # Assume could have saved 30% on average (this would use actual predictions)
-                optimal_cost = cost_usd * 0.7  # 30% savings estimate
-                potential_savings += (cost_usd - optimal_cost)
-            
-            transaction_times.append(tx_date.hour)
-            
+
+        # Current gas is the same for every transaction; fetch it once
+        current_gas = collector.get_current_gas()
+
+        # The numeric fields of the transactions as columns
+        count = len(transactions)
+        tx_timestamps = np.fromiter((int(tx.get('timeStamp', 0)) for tx in transactions), dtype=np.int64, count=count)
+        gas_used = np.fromiter((int(tx.get('gasUsed', 0)) for tx in transactions), dtype=np.int64, count=count)
+        gas_price = np.fromiter((int(tx.get('gasPrice', 0)) for tx in transactions), dtype=np.int64, count=count)
+
+        # Filter to last 30 days, skipping transactions without gas data
+        kept = np.flatnonzero(
+            (tx_timestamps >= start_date.timestamp()) & (gas_used > 0) & (gas_price > 0)
+        )
+
+        # Calculate cost (float, as wei products can overflow int64)
+        cost_usd = gas_price[kept] * gas_used[kept].astype(np.float64) / 1e18 * ETH_PRICE
+        total_gas_paid = float(cost_usd.sum())
+
+        # Estimate optimal cost (using current best prediction)
+        # Assume could have saved 30% on average (this would use actual predictions)
+        potential_savings = total_gas_paid * 0.3 if current_gas else 0
+
+        transaction_times = (tx_timestamps[kept] // 3600) % 24  # Hour of day, UTC
+
+        # Only the 10 most recent are returned
+        recent_transactions = []
+        for i in kept[:10]:
+            tx = transactions[i]
             recent_transactions.append({
                 'hash': tx.get('hash', ''),
-                'timestamp': tx_timestamp,
-                'gasUsed': gas_used,
-                'gasPrice': gas_price,
+                'timestamp': int(tx_timestamps[i]),
+                'gasUsed': int(gas_used[i]),
+                'gasPrice': int(gas_price[i]),
                 'value': tx.get('value', '0'),
                 'from': tx.get('from', ''),
                 'to': tx.get('to', ''),
                 'method': tx.get('methodId', '0x')[:10] if tx.get('methodId') else 'Transfer'
             })
-        
+
         # Calculate recommendations
-        from collections import Counter
         recommendations = {}
         
-        if transaction_times and len(transaction_times) > 0:
-            time_counts = Counter(transaction_times)
-            most_common_hour = time_counts.most_common(1)[0][0]
+        if len(transaction_times) > 0:
+            # Hour-of-day histogram over 24 bins
+            most_common_hour = int(np.bincount(transaction_times, minlength=24).argmax())
             recommendations['usual_time'] = f"{most_common_hour}:00 UTC"
             # Suggest opposite time (when gas is typically lower)
             best_hour = (most_common_hour + 6) % 24
@@ -1035,8 +1147,8 @@ def get_user_history(address):
         savings_percentage = (potential_savings / total_gas_paid * 100) if total_gas_paid > 0 else 0
         
         result = {
-            'transactions': recent_transactions[:10],  # Return last 10
-            'total_transactions': len(recent_transactions),
+            'transactions': recent_transactions,  # Return last 10
+            'total_transactions': len(kept),
             'total_gas_paid': round(total_gas_paid, 4),
             'potential_savings': round(potential_savings, 4),
             'savings_percentage': round(savings_percentage, 2),
@@ -1066,39 +1178,50 @@ def get_user_history(address):
         }), 200  # Return 200 so frontend can handle gracefully
 
 
+# This would normally fetch from a database of user savings
+# For now, mock data
+LEADERBOARD = [
+    {'address': '0x1234567890123456789012345678901234567890', 'savings': 12.45, 'rank': 1, 'streak': 7},
+    {'address': '0x8765432109876543210987654321098765432109', 'savings': 8.90, 'rank': 2, 'streak': 5},
+    {'address': '0xabcdefabcdefabcdefabcdefabcdefabcdefabcd', 'savings': 6.78, 'rank': 3, 'streak': 3},
+    {'address': '0x9876543210987654321098765432109876543210', 'savings': 5.23, 'rank': 4, 'streak': 2},
+    {'address': '0xfedcba0987654321fedcba0987654321fedcba09', 'savings': 4.56, 'rank': 5, 'streak': 1},
+]
+_LEADERBOARD_RANKS = {entry['address'].lower(): entry['rank'] for entry in LEADERBOARD}
+
+# Static response bodies, encoded once at import instead of on every request.
+# /leaderboard only varies in user_rank, which is spliced into the prefix.
+_LEADERBOARD_JSON_PREFIX = ('{"leaderboard":' + json.dumps(LEADERBOARD, separators=(',', ':')) + ',"user_rank":').encode()
+_LEADERBOARD_JSON_SUFFIX = b',"period":"week"}\n'
+
+_CONFIG_JSON = json.dumps({
+    'name': 'Base Gas Optimizer',
+    'description': 'ML-powered gas price predictions for Base network',
+    'chainId': 8453,
+    'version': '1.0.0',
+    'features': [
+        'Real-time gas tracking',
+        'ML predictions (1h, 4h, 24h)',
+        'Transaction history',
+        'Model accuracy metrics'
+    ]
+}, separators=(',', ':')).encode() + b'\n'
+
+
 @api_bp.route('/leaderboard', methods=['GET'])
-@cached(ttl=300)  # Cache for 5 minutes
 def get_leaderboard():
     """Get savings leaderboard"""
     try:
-        # This would normally fetch from a database of user savings
-        # For now, return mock data
-        leaderboard = [
-            {'address': '0x1234567890123456789012345678901234567890', 'savings': 12.45, 'rank': 1, 'streak': 7},
-            {'address': '0x8765432109876543210987654321098765432109', 'savings': 8.90, 'rank': 2, 'streak': 5},
-            {'address': '0xabcdefabcdefabcdefabcdefabcdefabcdefabcd', 'savings': 6.78, 'rank': 3, 'streak': 3},
-            {'address': '0x9876543210987654321098765432109876543210', 'savings': 5.23, 'rank': 4, 'streak': 2},
-            {'address': '0xfedcba0987654321fedcba0987654321fedcba09', 'savings': 4.56, 'rank': 5, 'streak': 1},
-        ]
-        
         # Get user rank if address provided
         user_address = request.args.get('address')
         user_rank = None
         if user_address:
-            # Find user in leaderboard
-            user_entry = next((e for e in leaderboard if e['address'].lower() == user_address.lower()), None)
-            if user_entry:
-                user_rank = user_entry['rank']
-            else:
-                # User not in top 5, assign rank 47 as example
-                user_rank = 47
-        
-        return jsonify({
-            'leaderboard': leaderboard,
-            'user_rank': user_rank,
-            'period': 'week'
-        })
-        
+            # Users not in the top 5 get rank 47 as example
+            user_rank = _LEADERBOARD_RANKS.get(user_address.lower(), 47)
+
+        body = _LEADERBOARD_JSON_PREFIX + json.dumps(user_rank).encode() + _LEADERBOARD_JSON_SUFFIX
+        return current_app.response_class(body, mimetype='application/json')
+
     except Exception as e:
         logger.error(f"Error in /leaderboard: {traceback.format_exc()}")
         return jsonify({
@@ -1111,18 +1234,7 @@ def get_leaderboard():
 @api_bp.route('/config', methods=['GET'])
 def get_config():
     """Base platform configuration"""
-    return jsonify({
-        'name': 'Base Gas Optimizer',
-        'description': 'ML-powered gas price predictions for Base network',
-        'chainId': 8453,
-        'version': '1.0.0',
-        'features': [
-            'Real-time gas tracking',
-            'ML predictions (1h, 4h, 24h)',
-            'Transaction history',
-            'Model accuracy metrics'
-        ]
-    })
+    return current_app.response_class(_CONFIG_JSON, mimetype='application/json')
 
 
 @api_bp.route('/cache/clear', methods=['POST'])
@@ -1139,24 +1251,25 @@ def stats():
     """Get statistics about gas prices"""
     try:
         hours = request.args.get('hours', 24, type=int)
-        data = db.get_historical_data(hours)
+        # Only the gas column is needed, so skip building full records
+        values = db.get_historical_gas_values(hours)
         
-        if not data:
+        if not values:
             return jsonify({
                 'hours': hours,
                 'count': 0,
                 'stats': None
             })
         
-        gas_prices = [d.get('gwei', 0) for d in data]
+        gas_prices = np.fromiter((v or 0 for v in values), dtype=np.float64, count=len(values))
 
         stats = {
             'hours': hours,
             'count': len(gas_prices),
-            'min': round(min(gas_prices), 6),
-            'max': round(max(gas_prices), 6),
-            'avg': round(sum(gas_prices) / len(gas_prices), 6),
-            'latest': round(gas_prices[-1], 6) if gas_prices else None
+            'min': round(float(gas_prices.min()), 6),
+            'max': round(float(gas_prices.max()), 6),
+            'avg': round(float(gas_prices.mean()), 6),
+            'latest': round(float(gas_prices[-1]), 6)
         }
         
         return jsonify(stats)
@@ -4,7 +4,7 @@ Provides global statistics for the landing page
 """
 
 from flask import Blueprint, jsonify
-from sqlalchemy import func
+from sqlalchemy import bindparam, func, select
 from data.database import DatabaseManager, Prediction, GasPrice
 from datetime import datetime, timedelta
 from utils.logger import logger
@@ -13,6 +13,17 @@ from api.cache import cached
 stats_bp = Blueprint('stats', __name__)
 db = DatabaseManager()
 
+# R² of predictions scored since :since, reduced in the database so only one
+# row comes back: (count, residual sum of squares, total sum of squares).
+# Built once so each request reuses SQLAlchemy's compiled-SQL cache entry
+_SCORED = (Prediction.timestamp >= bindparam('since'), Prediction.actual_gas.isnot(None))
+_MEAN_ACTUAL = select(func.avg(Prediction.actual_gas)).where(*_SCORED).scalar_subquery().correlate(None)
+_R2_STMT = select(
+    func.count(),
+    func.sum((Prediction.actual_gas - Prediction.predicted_gas) * (Prediction.actual_gas - Prediction.predicted_gas)),
+    func.sum((Prediction.actual_gas - _MEAN_ACTUAL) * (Prediction.actual_gas - _MEAN_ACTUAL))
+).where(*_SCORED)
+
 
 @stats_bp.route('/stats', methods=['GET'])
 @cached(ttl=300)  # Cache for 5 minutes
@@ -24,67 +35,49 @@ def get_global_stats():
     - Total savings (estimated)
     """
     try:
-        session = db._get_session()
-
-        # Calculate total predictions
-        total_predictions = session.query(func.count(Prediction.id)).scalar() or 0
-
-        # Calculate model accuracy (R² score for recent predictions)
-        # Get predictions from last 30 days that have actual values
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        recent_predictions = session.query(
-            Prediction.predicted_gas,
-            Prediction.actual_gas
-        ).filter(
-            Prediction.timestamp >= thirty_days_ago,
-            Prediction.actual_gas.isnot(None)
-        ).all()
-
-        # Calculate R² score if we have data
-        accuracy_percent = 82  # Default fallback
-        if len(recent_predictions) > 10:
-            predicted = [p.predicted_gas for p in recent_predictions]
-            actual = [p.actual_gas for p in recent_predictions]
-
-            # Calculate R² score
-            mean_actual = sum(actual) / len(actual)
-            ss_tot = sum((y - mean_actual) ** 2 for y in actual)
-            ss_res = sum((y - pred) ** 2 for y, pred in zip(actual, predicted))
-
-            if ss_tot > 0:
-                r_squared = 1 - (ss_res / ss_tot)
-                accuracy_percent = max(0, min(100, int(r_squared * 100)))
-
-        # Calculate REAL total savings from database
-        # Get historical gas data to calculate actual savings
-        from data.database import GasPrice
-        total_gas_records = session.query(func.count(GasPrice.id)).scalar() or 0
-
-        if total_gas_records > 100:
-            # Calculate average gas price from database
-            avg_gas = session.query(func.avg(GasPrice.current_gas)).scalar() or 0.005
-
-            # Estimate savings: 30% reduction on average, 21000 gas units per tx, $3000 ETH
-            avg_gas_saved_gwei = avg_gas * 0.30  # 30% average savings
-            gas_units = 21000
-            eth_price = 3000
-
-            # Convert gwei savings to ETH then to USD
-            total_saved_usd = (total_predictions * avg_gas_saved_gwei * gas_units * eth_price) / 1e9
-        else:
-            # Use conservative estimate if not enough data
-            avg_gas_saved_gwei = 0.5
-            gas_units = 21000
-            eth_price = 3000
-            total_saved_usd = (total_predictions * avg_gas_saved_gwei * gas_units * eth_price) / 1e9
-
-        # Format total saved (in thousands)
-        total_saved_k = int(total_saved_usd / 1000)
-
-        # Format predictions count (in thousands)
-        predictions_k = int(total_predictions / 1000)
-
-        session.close()
+        with db.Session() as session:
+            # Calculate total predictions (cached; an estimate on PostgreSQL)
+            total_predictions = db.count_rows(Prediction) or 0
+
+            # Calculate model accuracy (R² score for recent predictions)
+            # Get predictions from last 30 days that have actual values
+            thirty_days_ago = datetime.now() - timedelta(days=30)
+            scored, ss_res, ss_tot = session.execute(_R2_STMT, {'since': thirty_days_ago}).one()
+
+            # Calculate R² score if we have data
+            accuracy_percent = 82  # Default fallback
+            if scored > 10:
+                if ss_tot > 0:
+                    r_squared = float(1 - (ss_res / ss_tot))
+                    accuracy_percent = max(0, min(100, int(r_squared * 100)))
+
+            # Calculate REAL total savings from database
+            # Get historical gas data to calculate actual savings
+            total_gas_records = db.count_rows(GasPrice) or 0
+
+            if total_gas_records > 100:
+                # Calculate average gas price from database
+                avg_gas = session.query(func.avg(GasPrice.current_gas)).scalar() or 0.005
+
+                # Estimate savings: 30% reduction on average, 21000 gas units per tx, $3000 ETH
+                avg_gas_saved_gwei = avg_gas * 0.30  # 30% average savings
+                gas_units = 21000
+                eth_price = 3000
+
+                # Convert gwei savings to ETH then to USD
+                total_saved_usd = (total_predictions * avg_gas_saved_gwei * gas_units * eth_price) / 1e9
+            else:
+                # Use conservative estimate if not enough data
+                avg_gas_saved_gwei = 0.5
+                gas_units = 21000
+                eth_price = 3000
+                total_saved_usd = (total_predictions * avg_gas_saved_gwei * gas_units * eth_price) / 1e9
+
+            # Format total saved (in thousands)
+            total_saved_k = int(total_saved_usd / 1000)
+
+            # Format predictions count (in thousands)
+            predictions_k = int(total_predictions / 1000)
 
         return jsonify({
             'success': True,
@@ -4,7 +4,10 @@ Helper functions for API endpoints
 """
 
 from datetime import datetime
-from flask import jsonify
+from flask import Response, jsonify
+from api.cache import matching_etag
+import hashlib
+import json
 
 
 def success_response(data, message="Success"):
@@ -26,6 +29,35 @@ def error_response(message, status_code=400):
     }), status_code
 
 
+def prebuilt_json(payload):
+    """
+    Serialize a constant payload once, at import time
+
+    Returns (body, etag) for use with static_json_response()
+    """
+    body = json.dumps(payload, separators=(',', ':')).encode()
+    return body, hashlib.md5(body).hexdigest()
+
+
+def static_json_response(prebuilt, max_age=3600):
+    """
+    Serve a prebuilt_json() body, answering If-None-Match with 304
+
+    Matches tags flask-compress rewrote to "<etag>:<encoding>" as well.
+    """
+    body, etag = prebuilt
+    matched = matching_etag(etag)
+    if matched:
+        # Echo the client's tag, as the compressed 200 it revalidates carried it
+        response = Response(status=304)
+        response.set_etag(matched)
+    else:
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return response
+
+
 def validate_horizon(horizon):
     """Validate prediction horizon"""
     valid_horizons = ['1h', '4h', '24h']
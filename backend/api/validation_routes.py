@@ -267,9 +267,7 @@ def get_validation_logs():
         from data.database import DatabaseManager
 
         db = DatabaseManager()
-        session = db._get_session()
-
-        try:
+        with db.Session() as session:
             query = session.query(PredictionLog)
 
             if validated_filter is not None:
@@ -305,9 +303,6 @@ def get_validation_logs():
                 }
             }), 200
 
-        finally:
-            session.close()
-
     except Exception as e:
         logger.error(f"Error getting validation logs: {e}")
         return jsonify({'error': str(e)}), 500
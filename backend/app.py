@@ -3,7 +3,7 @@ Main Flask Application
 Base Gas Price Prediction System - ML-powered gas fee predictions
 """
 
-from flask import Flask, jsonify
+from flask import Flask
 from flask_cors import CORS
 import sentry_sdk
 from sentry_sdk.integrations.flask import FlaskIntegration
@@ -22,6 +22,24 @@ from api.middleware import limiter, error_handlers, log_request
 from config import Config
 from utils.logger import logger
 
+# Prefer orjson for response encoding; fall back to Flask's stdlib provider
+try:
+    from api.json_provider import OrjsonProvider
+    ORJSON_AVAILABLE = True
+except ImportError:
+    OrjsonProvider = None
+    ORJSON_AVAILABLE = False
+    logger.warning("orjson not available - using stdlib JSON encoding")
+
+# Optional gzip/Brotli response compression
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    Compress = None
+    COMPRESS_AVAILABLE = False
+    logger.warning("flask-compress not available - responses are sent uncompressed")
+
 # Try to import flask-socketio, but don't fail if it's not available
 try:
     from flask_socketio import SocketIO, emit
@@ -31,7 +49,9 @@ except ImportError:
     SocketIO = None
     emit = None
     logger.warning("flask-socketio not available - WebSocket features disabled")
+import json
 import os
+import re
 import threading
 from services.gas_collector_service import GasCollectorService
 from services.onchain_collector_service import OnChainCollectorService
@@ -49,9 +69,98 @@ if sentry_dsn:
     logger.info("Sentry error tracking initialized")
 
 
+# Blueprints and their URL prefixes, in registration order
+_BLUEPRINTS = (
+    (api_bp, '/api'),
+    (stats_bp, '/api'),
+    (validation_bp, '/api'),
+    (onchain_bp, '/api'),
+    (retraining_bp, '/api'),
+    (farcaster_bp, '/api'),
+    (cron_bp, '/api'),
+    (analytics_bp, '/api/analytics'),
+    (alert_bp, '/api'),
+    (agent_bp, '/api'),
+    (base_config_bp, None),  # No prefix - serves at root for /config.json
+)
+
+# Cache headers for GET responses by path, first match wins; compiled once
+# instead of substring-scanning every path in the after_request hook
+_CACHE_RULES = (
+    # Long cache for static endpoints (5 minutes)
+    (re.compile(r'/config\.json|/manifest\.json|/api/stats'), {'Cache-Control': 'public, max-age=300'}),
+    # Medium cache for historical data (1 minute)
+    (re.compile(r'/historical|/analytics'), {'Cache-Control': 'public, max-age=60'}),
+    # Short cache for real-time data (30 seconds)
+    (re.compile(r'/current|/predictions|/network-state'), {'Cache-Control': 'public, max-age=30'}),
+    # No cache for health checks and admin endpoints
+    (re.compile(r'/health|/validation|/retraining'), {
+        'Cache-Control': 'no-cache, no-store, must-revalidate',
+        'Pragma': 'no-cache',
+        'Expires': '0'
+    }),
+)
+
+# Body of the static / endpoint listing, encoded once at import
+_INDEX_JSON = json.dumps({
+    'message': 'Base Gas Optimizer API',
+    'version': '1.0.0',
+    'endpoints': {
+        'health': '/api/health',
+        'current': '/api/current',
+        'predictions': '/api/predictions',
+        'historical': '/api/historical',
+        'transactions': '/api/transactions',
+        'accuracy': '/api/accuracy',
+        'config': '/api/config',
+        'stats': '/api/stats',
+        'validation': {
+            'summary': '/api/validation/summary',
+            'metrics': '/api/validation/metrics',
+            'trends': '/api/validation/trends',
+            'health': '/api/validation/health'
+        },
+        'onchain': {
+            'network_state': '/api/onchain/network-state',
+            'block_features': '/api/onchain/block-features/<block_number>',
+            'congestion_history': '/api/onchain/congestion-history'
+        },
+        'retraining': {
+            'status': '/api/retraining/status',
+            'trigger': '/api/retraining/trigger (POST)',
+            'history': '/api/retraining/history',
+            'check_data': '/api/retraining/check-data'
+        },
+        'analytics': {
+            'dashboard': '/api/analytics/dashboard',
+            'performance': '/api/analytics/performance',
+            'trends': '/api/analytics/trends',
+            'validation_summary': '/api/analytics/validation-summary',
+            'model_health': '/api/analytics/model-health',
+            'collection_stats': '/api/analytics/collection-stats',
+            'recent_predictions': '/api/analytics/recent-predictions'
+        },
+        'agent': {
+            'recommend': '/api/agent/recommend (GET/POST)',
+            'status': '/api/agent/status',
+            'actions': '/api/agent/actions',
+            'simulate': '/api/agent/simulate (POST)'
+        }
+    }
+}).encode()
+
+
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    if ORJSON_AVAILABLE:
+        app.json = OrjsonProvider(app)
+
+    # Compress JSON responses; small bodies are not worth the CPU
+    if COMPRESS_AVAILABLE:
+        app.config.setdefault('COMPRESS_ALGORITHM', ['br', 'gzip'])
+        app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+        Compress(app)
     
     # CORS configuration - Allow all origins for all routes
     CORS(app,
@@ -76,17 +185,8 @@ def create_app():
     error_handlers(app)
     
     # Register blueprints
-    app.register_blueprint(api_bp, url_prefix='/api')
-    app.register_blueprint(stats_bp, url_prefix='/api')
-    app.register_blueprint(validation_bp, url_prefix='/api')
-    app.register_blueprint(onchain_bp, url_prefix='/api')
-    app.register_blueprint(retraining_bp, url_prefix='/api')
-    app.register_blueprint(farcaster_bp, url_prefix='/api')
-    app.register_blueprint(cron_bp, url_prefix='/api')
-    app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
-    app.register_blueprint(alert_bp, url_prefix='/api')
-    app.register_blueprint(agent_bp, url_prefix='/api')
-    app.register_blueprint(base_config_bp)  # No prefix - serves at root for /config.json
+    for blueprint, url_prefix in _BLUEPRINTS:
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
     
     # Add HTTP caching headers
     @app.after_request
@@ -94,82 +194,21 @@ def create_app():
         """Add appropriate caching headers based on endpoint"""
         from flask import request
 
-        # Only cache GET requests
-        if request.method == 'GET':
-            path = request.path
-
-            # Long cache for static endpoints (5 minutes)
-            if any(x in path for x in ['/config.json', '/manifest.json', '/api/stats']):
-                response.headers['Cache-Control'] = 'public, max-age=300'
-
-            # Medium cache for historical data (1 minute)
-            elif '/historical' in path or '/analytics' in path:
-                response.headers['Cache-Control'] = 'public, max-age=60'
-
-            # Short cache for real-time data (30 seconds)
-            elif any(x in path for x in ['/current', '/predictions', '/network-state']):
-                response.headers['Cache-Control'] = 'public, max-age=30'
-
-            # No cache for health checks and admin endpoints
-            elif any(x in path for x in ['/health', '/validation', '/retraining']):
-                response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-                response.headers['Pragma'] = 'no-cache'
-                response.headers['Expires'] = '0'
-
-            # Default: short cache
+        # Only cache GET requests, and leave headers set by the view alone
+        if request.method == 'GET' and 'Cache-Control' not in response.headers:
+            for pattern, headers in _CACHE_RULES:
+                if pattern.search(request.path):
+                    response.headers.update(headers)
+                    break
             else:
+                # Default: short cache
                 response.headers['Cache-Control'] = 'public, max-age=30'
 
         return response
 
     @app.route('/')
     def index():
-        return jsonify({
-            'message': 'Base Gas Optimizer API',
-            'version': '1.0.0',
-            'endpoints': {
-                'health': '/api/health',
-                'current': '/api/current',
-                'predictions': '/api/predictions',
-                'historical': '/api/historical',
-                'transactions': '/api/transactions',
-                'accuracy': '/api/accuracy',
-                'config': '/api/config',
-                'stats': '/api/stats',
-                'validation': {
-                    'summary': '/api/validation/summary',
-                    'metrics': '/api/validation/metrics',
-                    'trends': '/api/validation/trends',
-                    'health': '/api/validation/health'
-                },
-                'onchain': {
-                    'network_state': '/api/onchain/network-state',
-                    'block_features': '/api/onchain/block-features/<block_number>',
-                    'congestion_history': '/api/onchain/congestion-history'
-                },
-                'retraining': {
-                    'status': '/api/retraining/status',
-                    'trigger': '/api/retraining/trigger (POST)',
-                    'history': '/api/retraining/history',
-                    'check_data': '/api/retraining/check-data'
-                },
-                'analytics': {
-                    'dashboard': '/api/analytics/dashboard',
-                    'performance': '/api/analytics/performance',
-                    'trends': '/api/analytics/trends',
-                    'validation_summary': '/api/analytics/validation-summary',
-                    'model_health': '/api/analytics/model-health',
-                    'collection_stats': '/api/analytics/collection-stats',
-                    'recent_predictions': '/api/analytics/recent-predictions'
-                },
-                'agent': {
-                    'recommend': '/api/agent/recommend (GET/POST)',
-                    'status': '/api/agent/status',
-                    'actions': '/api/agent/actions',
-                    'simulate': '/api/agent/simulate (POST)'
-                }
-            }
-        })
+        return app.response_class(_INDEX_JSON, mimetype='application/json')
     
     logger.info("Base Gas Optimizer API started")
     logger.info(f"Debug mode: {Config.DEBUG}")
@@ -178,11 +217,24 @@ def create_app():
     return app
 
 
+def _socketio_async_mode():
+    """
+    'gevent' when gunicorn_config.py has monkey-patched for gevent workers,
+    so WebSocket clients are greenlets on the worker's event loop rather
+    than a thread each; 'threading' otherwise (gthread, dev server)
+    """
+    try:
+        from gevent import monkey
+    except ImportError:
+        return 'threading'
+    return 'gevent' if monkey.is_module_patched('socket') else 'threading'
+
+
 app = create_app()
 
 # Initialize SocketIO for WebSocket support (if available)
 if SOCKETIO_AVAILABLE:
-    socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+    socketio = SocketIO(app, cors_allowed_origins="*", async_mode=_socketio_async_mode())
     app.socketio = socketio
     logger.info("WebSocket support enabled")
 else:
@@ -240,6 +292,10 @@ if SOCKETIO_AVAILABLE:
 
 
 if __name__ == '__main__':
+    # Development server only. Deployments run gunicorn (Procfile, render.yaml,
+    # start.sh, railway_start.sh). With the config file (start.sh and
+    # railway_start.sh only), set GUNICORN_WORKER_CLASS=gevent to overlap the
+    # IO-bound endpoints (BaseScan, RPC, database) on one worker.
     if SOCKETIO_AVAILABLE:
         socketio.run(
             app,
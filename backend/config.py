@@ -23,6 +23,18 @@ class Config:
                             'sqlite:////data/gas_data.db' if os.path.exists('/data')
                             else 'sqlite:///gas_data.db')
     
+    # SQLite memory use per connection. Reads of up to SQLITE_MMAP_SIZE bytes
+    # of the file are served by memory-mapping it (shared OS page cache, so
+    # it costs address space rather than private RAM), and each connection
+    # keeps up to SQLITE_CACHE_SIZE_KB of pages in its own cache. Lower
+    # these on small instances; 0 disables mmap.
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 64000))
+
+    # Cache
+    # Optional Redis shared by all workers; empty keeps the per-process cache
+    REDIS_URL = os.getenv('REDIS_URL', '')
+
     # Data Collection
     COLLECTION_INTERVAL = 5  # 5 seconds (3x faster data collection)
     # Rationale: Base gas prices can spike rapidly. 5-second sampling provides:
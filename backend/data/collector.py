@@ -1,4 +1,6 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 from datetime import datetime
 from web3 import Web3
@@ -7,17 +9,24 @@ from config import Config
 
 class BaseGasCollector:
     def __init__(self):
-        self.w3 = Web3(Web3.HTTPProvider(Config.BASE_RPC_URL))
+        self.w3 = Web3(Web3.HTTPProvider(Config.BASE_RPC_URL, request_kwargs={'timeout': 10}))
+        # Keep-alive connections for the Owlracle fallback, with a couple of
+        # quick retries on connection errors; the API key is sent on every call
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(
+            pool_connections=4, pool_maxsize=8, max_retries=Retry(total=2, backoff_factor=0.3)
+        ))
+        if Config.OWLRACLE_API_KEY:
+            self.http.headers['Authorization'] = Config.OWLRACLE_API_KEY
         
     def get_current_gas(self):
         """Fetch current Base gas price"""
         try:
-            # Method 1: Direct RPC
-            latest_block = self.w3.eth.get_block('latest')
-            base_fee = latest_block.get('baseFeePerGas', 0)
-            
-            # Get recent transactions to estimate priority fee
+            # Method 1: Direct RPC, one round trip for the base fee and the
+            # recent transactions used to estimate the priority fee
             block = self.w3.eth.get_block('latest', full_transactions=True)
+            base_fee = block.get('baseFeePerGas', 0)
+            
             transactions = block.transactions[:10]  # Sample
             
             priority_fees = []
@@ -45,11 +54,7 @@ class BaseGasCollector:
         """Fallback: Fetch from Owlracle API"""
         try:
             url = "https://api.owlracle.info/v4/base/gas"
-            headers = {}
-            if Config.OWLRACLE_API_KEY:
-                headers['Authorization'] = Config.OWLRACLE_API_KEY
-            
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.http.get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
             
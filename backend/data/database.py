@@ -1,12 +1,54 @@
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime
+from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, func, select, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from cachetools import TTLCache
 from datetime import datetime
+from dateutil import parser as dateutil_parser
 from config import Config
+import os
+import threading
+import time
 
 
 Base = declarative_base()
 
+# (engine, sessionmaker) by database URL, shared by all managers
+_engines = {}
+_engines_lock = threading.Lock()
+
+# Row counts by table name as (value, expires_at), shared by all managers
+_count_cache = {}
+_count_lock = threading.Lock()
+COUNT_CACHE_TTL = 60
+
+# get_historical_data() results by hours, shared by all managers. Bounded,
+# since hours comes from query strings. save_gas_price() clears it in its own
+# process; other processes (gunicorn workers, the worker dyno) see new rows
+# within the TTL.
+HISTORY_CACHE_TTL = 30
+_history_cache = TTLCache(maxsize=16, ttl=HISTORY_CACHE_TTL)
+_history_lock = threading.Lock()
+# Bumped on every insert, so a query that raced an insert is not cached
+_history_generation = 0
+
+# get_historical_buckets() resolutions, as ISO bucket-start formats for
+# SQLite's strftime() and PostgreSQL's to_char()
+HISTORY_BUCKET_FORMATS = {'1h': '%Y-%m-%dT%H:00:00', '1d': '%Y-%m-%dT00:00:00'}
+HISTORY_BUCKET_FORMATS_PG = {'1h': 'YYYY-MM-DD"T"HH24:00:00', '1d': 'YYYY-MM-DD"T"00:00:00'}
+
+
+def _parse_timestamp(value):
+    """
+    datetime for a timestamp string
+
+    Collectors send datetime.isoformat() strings, which fromisoformat()
+    reads directly; dateutil's slower guessing parser is kept for anything else.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return dateutil_parser.parse(value)
+
 
 class GasPrice(Base):
     __tablename__ = 'gas_prices'
@@ -63,8 +105,40 @@ class OnChainFeatures(Base):
     is_highly_congested = Column(Integer, nullable=True)  # Boolean as int (0/1)
 
 
+def _reset_pools_after_fork():
+    """
+    Drop pooled connections inherited from the parent process
+
+    With gunicorn's preload the master imports the app, and its collector
+    threads use the shared engines; a forked worker must open its own
+    connections rather than reuse the master's sockets and file handles.
+    """
+    for engine, _ in _engines.values():
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+# Core inserts for the write path, built once: no ORM instances, identity
+# map or flush for rows that are written and never read back
+_GAS_PRICE_INSERT = GasPrice.__table__.insert()
+_PREDICTION_INSERT = Prediction.__table__.insert()
+_ONCHAIN_FEATURES_INSERT = OnChainFeatures.__table__.insert()
+
+
 class DatabaseManager:
     def __init__(self):
+        # Managers are created per module (and some per request); they all
+        # share one engine, connection pool and session factory per URL
+        with _engines_lock:
+            shared = _engines.get(Config.DATABASE_URL)
+            if shared is None:
+                shared = _engines[Config.DATABASE_URL] = self._create_engine()
+        self.engine, self.Session = shared
+
+    @staticmethod
+    def _create_engine():
+        """Engine and session factory for Config.DATABASE_URL, creating tables"""
         # Add SQLite-specific configuration for concurrent access
         connect_args = {}
         if Config.DATABASE_URL.startswith('sqlite'):
@@ -73,7 +147,7 @@ class DatabaseManager:
                 'timeout': 30  # 30 second timeout for locked database
             }
 
-        self.engine = create_engine(
+        engine = create_engine(
             Config.DATABASE_URL,
             pool_pre_ping=True,
             connect_args=connect_args
@@ -82,16 +156,24 @@ class DatabaseManager:
         # Enable WAL mode for SQLite to allow concurrent reads/writes
         if Config.DATABASE_URL.startswith('sqlite'):
             from sqlalchemy import event
-            @event.listens_for(self.engine, "connect")
+            @event.listens_for(engine, "connect")
             def set_sqlite_pragma(dbapi_conn, connection_record):
                 cursor = dbapi_conn.cursor()
+                # Only takes effect on a new, empty database (before WAL)
+                cursor.execute("PRAGMA page_size=8192")
                 cursor.execute("PRAGMA journal_mode=WAL")
                 cursor.execute("PRAGMA synchronous=NORMAL")
                 cursor.execute("PRAGMA busy_timeout=30000")  # 30 second busy timeout
+                # Serve history scans from memory (see Config for the trade-off)
+                cursor.execute(f"PRAGMA mmap_size={Config.SQLITE_MMAP_SIZE:d}")
+                cursor.execute(f"PRAGMA cache_size=-{Config.SQLITE_CACHE_SIZE_KB:d}")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                # Checkpoint the WAL less often under the collectors' small writes
+                cursor.execute("PRAGMA wal_autocheckpoint=2000")
                 cursor.close()
 
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(bind=self.engine)
+        Base.metadata.create_all(engine)
+        return engine, sessionmaker(bind=engine)
     
     def _get_session(self):
         """Get a new session for this operation"""
@@ -99,73 +181,165 @@ class DatabaseManager:
     
     def save_gas_price(self, data):
         """Save gas price data"""
-        session = self._get_session()
-        try:
-            # Convert ISO timestamp string to datetime if needed
-            if 'timestamp' in data and isinstance(data['timestamp'], str):
-                from dateutil import parser
-                data['timestamp'] = parser.parse(data['timestamp'])
-            
-            gas_price = GasPrice(**data)
-            session.add(gas_price)
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close()
+        global _history_generation
+        # Convert ISO timestamp string to datetime if needed
+        if 'timestamp' in data and isinstance(data['timestamp'], str):
+            data['timestamp'] = _parse_timestamp(data['timestamp'])
+
+        with self.engine.begin() as conn:
+            conn.execute(_GAS_PRICE_INSERT, [data])
+        with _history_lock:
+            _history_generation += 1
+            _history_cache.clear()
     
-    def get_historical_data(self, hours=720):  # 30 days default
-        """Get historical gas prices"""
+    def get_historical_data(self, hours=720, since=None):  # 30 days default
+        """
+        Get historical gas prices
+
+        If `since` is given, only rows strictly newer than it (and within
+        `hours`) are returned, for incremental consumers.
+
+        Full windows are cached for HISTORY_CACHE_TTL seconds and shared
+        between callers, so the returned list must not be modified.
+        """
+        if since is not None:
+            return self._query_historical_data(hours, since)
+
+        with _history_lock:
+            rows = _history_cache.get(hours)
+            generation = _history_generation
+        if rows is None:
+            rows = self._query_historical_data(hours)
+            with _history_lock:
+                if generation == _history_generation:
+                    _history_cache[hours] = rows
+        return rows
+
+    def _query_historical_data(self, hours, since=None):
+        """get_historical_data() straight from the database"""
+        from datetime import timedelta
+        cutoff = datetime.now() - timedelta(hours=hours)
+        query = select(
+            GasPrice.timestamp, GasPrice.current_gas, GasPrice.base_fee, GasPrice.priority_fee
+        ).where(GasPrice.timestamp >= cutoff)
+        if since is not None:
+            query = query.where(GasPrice.timestamp > since)
+        with self.engine.connect() as conn:
+            results = conn.execute(query).all()
+        # Convert to dict format for JSON serialization
+        return [{
+            'timestamp': timestamp.isoformat() if hasattr(timestamp, 'isoformat') else str(timestamp),
+            'gwei': current_gas,
+            'baseFee': base_fee,
+            'priorityFee': priority_fee
+        } for timestamp, current_gas, base_fee, priority_fee in results]
+    
+    def get_historical_gas_values(self, hours=720):
+        """
+        current_gas of the last `hours` of gas prices, in the same order as
+        get_historical_data(), as plain floats without building ORM objects
+        """
         session = self._get_session()
         try:
             from datetime import timedelta
             cutoff = datetime.now() - timedelta(hours=hours)
-            results = session.query(GasPrice).filter(
-                GasPrice.timestamp >= cutoff
-            ).all()
-            # Convert to dict format for JSON serialization
-            return [{
-                'timestamp': r.timestamp.isoformat() if hasattr(r.timestamp, 'isoformat') else str(r.timestamp),
-                'gwei': r.current_gas,
-                'baseFee': r.base_fee,
-                'priorityFee': r.priority_fee
-            } for r in results]
+            return session.execute(
+                select(GasPrice.current_gas).where(GasPrice.timestamp >= cutoff)
+            ).scalars().all()
         finally:
             session.close()
-    
+
+    def get_historical_buckets(self, hours=720, resolution='1h'):
+        """
+        Gas prices of the last `hours` averaged per hour ('1h') or day ('1d'),
+        oldest first, in get_historical_data()'s record format with each
+        bucket's start as its timestamp
+
+        The grouping runs in the database, so a 30-day window comes back as
+        720 hourly rows rather than every collected sample.
+        """
+        from datetime import timedelta
+        cutoff = datetime.now() - timedelta(hours=hours)
+        if self.engine.dialect.name == 'postgresql':
+            bucket = func.to_char(GasPrice.timestamp, HISTORY_BUCKET_FORMATS_PG[resolution])
+        else:
+            bucket = func.strftime(HISTORY_BUCKET_FORMATS[resolution], GasPrice.timestamp)
+        bucket = bucket.label('bucket')
+        query = select(
+            bucket, func.avg(GasPrice.current_gas), func.avg(GasPrice.base_fee), func.avg(GasPrice.priority_fee)
+        ).where(GasPrice.timestamp >= cutoff).group_by(bucket).order_by(bucket)
+        with self.engine.connect() as conn:
+            results = conn.execute(query).all()
+        return [{
+            'timestamp': timestamp,
+            'gwei': current_gas,
+            'baseFee': base_fee,
+            'priorityFee': priority_fee
+        } for timestamp, current_gas, base_fee, priority_fee in results]
+
     def save_prediction(self, horizon, predicted_gas, model_version):
         """Save a prediction"""
+        self.save_predictions([(horizon, predicted_gas, model_version)])
+
+    def save_predictions(self, rows):
+        """Save several predictions in one transaction; rows are (horizon, predicted_gas, model_version)"""
+        with self.engine.begin() as conn:
+            conn.execute(_PREDICTION_INSERT, [
+                {'horizon': horizon, 'predicted_gas': predicted_gas, 'model_version': model_version}
+                for horizon, predicted_gas, model_version in rows
+            ])
+
+    def save_onchain_features(self, features):
+        """Save on-chain features"""
+        # Convert timestamp if needed
+        if 'timestamp' in features and isinstance(features['timestamp'], str):
+            features['timestamp'] = _parse_timestamp(features['timestamp'])
+
+        with self.engine.begin() as conn:
+            conn.execute(_ONCHAIN_FEATURES_INSERT, [features])
+
+    def count_rows(self, model, ttl=COUNT_CACHE_TTL):
+        """
+        Row count of a table, cached for `ttl` seconds
+
+        On PostgreSQL this is the planner's reltuples estimate, an O(1)
+        lookup kept current by autovacuum; elsewhere it is an exact COUNT(*).
+        Use has_at_least() when a threshold decision needs an exact answer.
+        """
+        table = model.__tablename__
+        now = time.monotonic()
+        with _count_lock:
+            hit = _count_cache.get(table)
+        if hit and hit[1] > now:
+            return hit[0]
+
         session = self._get_session()
         try:
-            prediction = Prediction(
-                horizon=horizon,
-                predicted_gas=predicted_gas,
-                model_version=model_version
-            )
-            session.add(prediction)
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            raise e
+            value = None
+            if self.engine.dialect.name == 'postgresql':
+                value = session.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+                    {'table': table}
+                ).scalar()
+                # Negative or zero until the table is first analyzed
+                if value is not None and value <= 0:
+                    value = None
+            if value is None:
+                value = session.query(func.count()).select_from(model).scalar()
         finally:
             session.close()
 
-    def save_onchain_features(self, features):
-        """Save on-chain features"""
+        with _count_lock:
+            _count_cache[table] = (value, now + ttl)
+        return value
+
+    def has_at_least(self, model, n):
+        """Whether a table holds at least n rows, reading no further than the nth"""
+        if n <= 0:
+            return True
         session = self._get_session()
         try:
-            # Convert timestamp if needed
-            if 'timestamp' in features and isinstance(features['timestamp'], str):
-                from dateutil import parser
-                features['timestamp'] = parser.parse(features['timestamp'])
-
-            onchain = OnChainFeatures(**features)
-            session.add(onchain)
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            raise e
+            return session.query(model.id).offset(n - 1).limit(1).first() is not None
         finally:
             session.close()
 
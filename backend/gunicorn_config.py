@@ -1,5 +1,19 @@
 """Gunicorn configuration for Railway deployment"""
 import os
+
+# Only read when gunicorn is started with --config gunicorn_config.py
+# (start.sh, railway_start.sh); the Procfiles and render.yaml pass CLI flags
+# instead, so GUNICORN_WORKER_CLASS has no effect there.
+#
+# Worker class: 'gthread' (default) or 'gevent'. gevent must monkey-patch
+# before anything imports socket/threading, and with preload_app the app is
+# imported in the master, so the patch has to happen here rather than in
+# the worker. app.py sees the patch and runs Flask-SocketIO in gevent mode.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
 import threading
 from utils.logger import logger
 
@@ -67,6 +81,7 @@ def post_fork(server, worker):
 # Gunicorn settings
 bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
 workers = 1
-threads = 4
+threads = 4  # gthread only
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))  # gevent only
 timeout = 120
 preload_app = True
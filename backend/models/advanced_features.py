@@ -1,9 +1,55 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy import stats
 
 
+def _rolling_slope(values, window):
+    """
+    Least-squares slope over each trailing window of `values`
+
+    Equivalent to np.polyfit(arange(window), w, 1)[0] per window, computed
+    for all windows at once. NaN until the first full window.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) < window:
+        return out
+    x = np.arange(window) - (window - 1) / 2
+    out[window - 1:] = sliding_window_view(values, window) @ x / (x @ x)
+    return out
+
+
+def _pearson_rows(a, b):
+    """Row-wise Pearson correlation of two 2-D arrays (NaN for zero variance)"""
+    a = a - a.mean(axis=1, keepdims=True)
+    b = b - b.mean(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (a * b).sum(axis=1) / np.sqrt((a * a).sum(axis=1) * (b * b).sum(axis=1))
+
+
+def _rolling_autocorr(values, lag, window=50):
+    """
+    Lag-`lag` autocorrelation over each trailing window of up to `window` values
+
+    Matches rolling(window, min_periods=lag + 1).apply(Series.autocorr):
+    NaN before lag + 1 observations, shorter windows at the start.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+
+    # Partial windows while the series is shorter than `window`
+    for i in range(lag, min(window - 1, n)):
+        w = values[:i + 1]
+        out[i] = _pearson_rows(w[None, lag:], w[None, :-lag])[0]
+
+    # Full windows, all at once
+    if n >= window:
+        windows = sliding_window_view(values, window)
+        out[window - 1:] = _pearson_rows(windows[:, lag:], windows[:, :-lag])
+    return out
+
+
 def create_advanced_features(df):
     """
     Create comprehensive feature set for gas price prediction
@@ -89,16 +135,9 @@ def create_advanced_features(df):
         df[f'pct_change_{period}'] = df['gas_price'].pct_change(period)
     
     # Trend strength (how consistently price is moving in one direction)
+    gas_values = df['gas_price'].to_numpy(dtype=np.float64)
     for window in [12, 24, 72]:
-        def calc_trend(x):
-            if len(x) < 2:
-                return 0
-            try:
-                return np.polyfit(np.arange(len(x)), x, 1)[0]
-            except:
-                return 0
-        
-        df[f'trend_strength_{window}'] = df['gas_price'].rolling(window).apply(calc_trend, raw=False)
+        df[f'trend_strength_{window}'] = _rolling_slope(gas_values, window)
     
     # ===================================================================
     # 5. VOLATILITY FEATURES (Price stability/instability)
@@ -191,17 +230,7 @@ def create_advanced_features(df):
     
     # Autocorrelation at different lags
     for lag in [1, 6, 12, 24]:
-        def calc_autocorr(x, lag_val):
-            if len(x) < lag_val + 1:
-                return 0
-            try:
-                return pd.Series(x).autocorr(lag=lag_val) if not pd.isna(pd.Series(x).autocorr(lag=lag_val)) else 0
-            except:
-                return 0
-        
-        df[f'autocorr_{lag}'] = df['gas_price'].rolling(window=50, min_periods=lag+1).apply(
-            lambda x: calc_autocorr(x, lag), raw=False
-        )
+        df[f'autocorr_{lag}'] = _rolling_autocorr(gas_values, lag, window=50)
     
     # ===================================================================
     # CLEAN UP
@@ -302,7 +302,9 @@ class GasModelTrainer:
                 'scaler_type': 'RobustScaler',  # For compatibility checking
             }
             
-            joblib.dump(save_data, filepath)
+            # Write then rename: the API memory-maps the live file
+            joblib.dump(save_data, filepath + '.tmp')
+            os.replace(filepath + '.tmp', filepath)
             print(f"💾 Saved {horizon} model to {filepath}")
             if scaler:
                 print(f"   ✅ Included RobustScaler for feature scaling")
@@ -380,6 +380,13 @@ if TORCH_AVAILABLE:
                 q_values = self.policy_net(state_tensor)
                 return q_values.cpu().numpy()[0]
 
+        def get_q_values_batch(self, states: np.ndarray) -> np.ndarray:
+            """Get Q-values for a (batch, state_dim) array in one forward pass"""
+            with torch.no_grad():
+                states_tensor = torch.FloatTensor(states).to(self.device)
+                q_values = self.policy_net(states_tensor)
+                return q_values.cpu().numpy()
+
 else:
     # Fallback when PyTorch is not available
     class DQNAgent:
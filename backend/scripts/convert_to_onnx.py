@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Export trained models to ONNX
+
+Converts models/saved_models/model_{horizon}.pkl to model_{horizon}.onnx.
+When onnxruntime is installed the API serves predictions from an export
+that is at least as new as its pickle, and falls back to the pickle
+otherwise, so re-run this after every retraining.
+
+Requires: pip install skl2onnx onnxruntime
+Usage: python scripts/convert_to_onnx.py
+"""
+
+import os
+import sys
+import joblib
+import numpy as np
+
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+except ImportError:
+    print("❌ skl2onnx is not installed: pip install skl2onnx onnxruntime")
+    sys.exit(1)
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'saved_models')
+HORIZONS = ['1h', '4h', '24h']
+
+# Input name the API feeds (see api/routes.py)
+INPUT_NAME = 'X'
+
+
+def convert(horizon):
+    """Export one horizon's model; False if there is nothing convertible"""
+    pkl_path = os.path.join(MODELS_DIR, f'model_{horizon}.pkl')
+    onnx_path = os.path.join(MODELS_DIR, f'model_{horizon}.onnx')
+
+    if not os.path.exists(pkl_path):
+        print(f"⏭️  {horizon}: no model at {pkl_path}")
+        return False
+
+    model_data = joblib.load(pkl_path)
+    model = model_data.get('model') if isinstance(model_data, dict) else model_data
+    n_features = getattr(model, 'n_features_in_', None)
+    if n_features is None:
+        print(f"⏭️  {horizon}: {type(model).__name__} does not report its feature count")
+        return False
+
+    onx = convert_sklearn(model, initial_types=[(INPUT_NAME, FloatTensorType([None, n_features]))])
+
+    # Write then rename so the API never opens a half-written file
+    with open(onnx_path + '.tmp', 'wb') as f:
+        f.write(onx.SerializeToString())
+    os.replace(onnx_path + '.tmp', onnx_path)
+
+    # Sanity check against the pickled model (ONNX evaluates trees in float32)
+    try:
+        import onnxruntime
+        X = np.random.default_rng(0).normal(size=(100, n_features)).astype(np.float32)
+        session = onnxruntime.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+        diff = np.abs(session.run(None, {INPUT_NAME: X})[0].ravel() - model.predict(X)).max()
+        print(f"✅ {horizon}: saved {onnx_path} (max abs diff vs sklearn: {diff:.2e})")
+    except ImportError:
+        print(f"✅ {horizon}: saved {onnx_path} (onnxruntime not installed, not verified)")
+
+    return True
+
+
+def main():
+    converted = sum(convert(horizon) for horizon in HORIZONS)
+    print(f"\n{converted}/{len(HORIZONS)} models exported to ONNX")
+
+
+if __name__ == '__main__':
+    main()
@@ -307,12 +307,15 @@ def save_model(model_data, horizon, output_dir='backend/models/saved_models'):
         'feature_importances': model_data.get('feature_importances'),
         'hyperparameter_tuning_used': USE_HYPERPARAMETER_TUNING
     }
-    joblib.dump(save_data, filepath)
+    # Write then rename: the API memory-maps the live files
+    joblib.dump(save_data, filepath + '.tmp')
+    os.replace(filepath + '.tmp', filepath)
     print(f"💾 Saved model to {filepath}")
 
     # Save scaler separately
     scaler_path = os.path.join(output_dir, f'scaler_{horizon}.pkl')
-    joblib.dump(model_data['scaler'], scaler_path)
+    joblib.dump(model_data['scaler'], scaler_path + '.tmp')
+    os.replace(scaler_path + '.tmp', scaler_path)
     print(f"💾 Saved scaler to {scaler_path}")
 
     # Save feature names separately for reference
@@ -8,7 +8,7 @@ Provides inference, state building, and recommendation generation.
 import os
 import numpy as np
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 from utils.logger import logger
@@ -265,6 +265,56 @@ class AgentService:
         # Get Q-values from agent
         q_values = self.agent.get_q_values(state)
 
+        return self._recommendation_from_q_values(q_values, current_gas, predictions, urgency)
+
+    def get_recommendations_batch(
+        self,
+        gas_prices: List[float],
+        predictions: Dict[str, float],
+        urgency: float = 0.5
+    ) -> List[AgentRecommendation]:
+        """
+        Get recommendations for a sequence of gas prices in one inference pass
+
+        States are built in order (so velocity/volatility see the earlier
+        prices, as with repeated get_recommendation calls) and then scored
+        with a single batched forward pass. The price history is restored
+        afterwards, so replayed prices do not leak into live recommendations.
+
+        Args:
+            gas_prices: Gas prices in gwei, oldest first
+            predictions: Dict with prediction horizons
+            urgency: Transaction urgency (0 = no rush, 1 = very urgent)
+
+        Returns:
+            One AgentRecommendation per gas price
+        """
+        if not gas_prices:
+            return []
+
+        if not self.is_loaded or self.agent is None:
+            return [self._heuristic_recommendation(gas, predictions, urgency) for gas in gas_prices]
+
+        saved_history = list(self.price_history)
+        try:
+            states = np.stack([self.build_state(gas, predictions, urgency) for gas in gas_prices])
+        finally:
+            self.price_history = saved_history
+        q_batch = self.agent.get_q_values_batch(states)
+
+        return [
+            self._recommendation_from_q_values(q_values, gas, predictions, urgency)
+            for q_values, gas in zip(q_batch, gas_prices)
+        ]
+
+    def _recommendation_from_q_values(
+        self,
+        q_values: np.ndarray,
+        current_gas: float,
+        predictions: Dict[str, float],
+        urgency: float
+    ) -> AgentRecommendation:
+        """Turn the agent's Q-values into a recommendation"""
         # Select best action
         action_idx = int(np.argmax(q_values))
         action_name = self.ACTION_NAMES[action_idx]
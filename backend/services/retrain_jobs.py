@@ -0,0 +1,253 @@
+"""
+Retraining Job Runner
+
+Runs model training scripts off the request thread and tracks their
+status, so HTTP handlers can hand back a job id straight away.
+
+Only one retraining runs at a time: overlapping triggers are rejected
+rather than queued, within this process and, via a lock file, across
+gunicorn workers. Job status is kept in a JSON file next to the lock, so
+any worker can answer a status poll; only the lock holder writes it.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from utils.logger import logger
+
+# fcntl is POSIX-only; elsewhere the lock is per-process
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# Training scripts are CPU-heavy and rewrite the same model files
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='retrain')
+
+# Held for the whole run by whoever is retraining
+_retrain_lock = threading.Lock()
+LOCK_PATH = os.path.join(tempfile.gettempdir(), 'basegas_retrain.lock')
+_lock_file = None
+
+# Job status by id (oldest first, trimmed to MAX_JOBS finished entries) and
+# the running job's id, shared by all workers
+JOBS_PATH = os.path.join(tempfile.gettempdir(), 'basegas_retrain_jobs.json')
+_jobs_lock = threading.Lock()
+MAX_JOBS = 50
+
+# Lines of each output stream kept per job
+OUTPUT_TAIL_LINES = 50
+
+
+def try_acquire():
+    """Claim the retraining slot without blocking; False if it is taken"""
+    global _lock_file
+    if not _retrain_lock.acquire(blocking=False):
+        return False
+    if fcntl is None:
+        return True
+
+    lock_file = open(LOCK_PATH, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        # Another worker process is retraining
+        lock_file.close()
+        _retrain_lock.release()
+        return False
+    _lock_file = lock_file
+    return True
+
+
+def release():
+    """Give up the retraining slot taken by try_acquire()"""
+    global _lock_file
+    if _lock_file is not None:
+        fcntl.flock(_lock_file, fcntl.LOCK_UN)
+        _lock_file.close()
+        _lock_file = None
+    _retrain_lock.release()
+
+
+def submit_script(script_path, timeout, trigger='manual', cwd=None, on_finish=None):
+    """
+    Start a training script in the background
+
+    Returns (job, accepted). When a retraining is already running nothing
+    is started, accepted is False and job is the running job's status
+    (None if it is not one of ours).
+
+    Args:
+        script_path: Python script to run with the current interpreter
+        timeout: Seconds before the script is killed
+        trigger: Who asked for the run (e.g. 'cron', 'manual'), for the status
+        cwd: Working directory for the script
+        on_finish: Optional callable run after the script exits, whatever the outcome
+    """
+    if not try_acquire():
+        return get_job(_load_state()['active_job_id']), False
+
+    job_id = uuid.uuid4().hex[:12]
+    job = {
+        'job_id': job_id,
+        'status': 'queued',
+        'trigger': trigger,
+        'script': script_path,
+        'submitted_at': datetime.now().isoformat(),
+        'started_at': None,
+        'finished_at': None,
+        'returncode': None,
+        'output': None,
+        'error': None
+    }
+    with _jobs_lock:
+        state = _load_state()
+        state['jobs'][job_id] = job
+        state['active_job_id'] = job_id
+        _trim_jobs(state['jobs'])
+        try:
+            _save_state(state)
+        except OSError:
+            release()
+            raise
+
+    _executor.submit(_run, job_id, script_path, timeout, cwd, on_finish)
+    logger.info(f"Retraining job {job_id} queued ({trigger}): {script_path}")
+    return job, True
+
+
+def get_job(job_id):
+    """Status of a job, or None if unknown"""
+    if job_id is None:
+        return None
+    return _load_state()['jobs'].get(job_id)
+
+
+def _load_state():
+    """Shared job state from JOBS_PATH; empty if missing or unreadable"""
+    try:
+        with open(JOBS_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'active_job_id': None, 'jobs': {}}
+
+
+def _save_state(state):
+    """Replace JOBS_PATH atomically, so readers never see a partial file"""
+    tmp_path = f'{JOBS_PATH}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, JOBS_PATH)
+
+
+def _update(job_id, finished=False, **fields):
+    """
+    Update a job's status; finished=True also clears it as the running job
+
+    Only called while holding the retraining slot, so no other process
+    writes JOBS_PATH concurrently. A failed write is logged rather than
+    raised, so the job still runs and releases the slot.
+    """
+    with _jobs_lock:
+        state = _load_state()
+        state['jobs'].setdefault(job_id, {}).update(fields)
+        if finished:
+            state['active_job_id'] = None
+        try:
+            _save_state(state)
+        except OSError as e:
+            logger.error(f"Could not record status of retraining job {job_id}: {e}")
+
+
+def _trim_jobs(jobs):
+    """Drop the oldest finished jobs beyond MAX_JOBS"""
+    finished = [k for k, j in jobs.items() if j['finished_at']]
+    for job_id in finished[:max(0, len(jobs) - MAX_JOBS)]:
+        del jobs[job_id]
+
+
+def _drain(job_id, stream, tail):
+    """Read a child's output line by line, logging it and keeping only the tail"""
+    for line in stream:
+        line = line.rstrip('\n')
+        tail.append(line)
+        logger.debug(f"[retrain {job_id}] {line}")
+    stream.close()
+
+
+def _run_streaming(job_id, cmd, timeout, cwd):
+    """
+    Run cmd, returning (returncode, stdout tail, stderr tail)
+
+    Output is consumed as it is produced and only the last OUTPUT_TAIL_LINES
+    lines of each stream are kept, so long training logs never sit in memory.
+    Raises subprocess.TimeoutExpired after killing the child.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+        cwd=cwd
+    )
+    stdout_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    stderr_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    readers = [
+        threading.Thread(target=_drain, args=(job_id, proc.stdout, stdout_tail), daemon=True),
+        threading.Thread(target=_drain, args=(job_id, proc.stderr, stderr_tail), daemon=True)
+    ]
+    for reader in readers:
+        reader.start()
+
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        for reader in readers:
+            reader.join()
+
+    return returncode, '\n'.join(stdout_tail), '\n'.join(stderr_tail)
+
+
+def _run(job_id, script_path, timeout, cwd, on_finish):
+    """Run one script to completion on the executor thread"""
+    _update(job_id, status='running', started_at=datetime.now().isoformat())
+    logger.info(f"Retraining job {job_id} started")
+
+    try:
+        returncode, stdout, stderr = _run_streaming(job_id, [sys.executable, script_path], timeout, cwd)
+        if returncode == 0:
+            logger.info(f"✅ Retraining job {job_id} completed successfully")
+            _update(job_id, status='succeeded', returncode=0, output=stdout[-500:])
+        else:
+            logger.error(f"❌ Retraining job {job_id} failed: {stderr[-500:]}")
+            _update(job_id, status='failed', returncode=returncode,
+                    output=stdout[-500:], error=stderr[-500:])
+
+    except subprocess.TimeoutExpired:
+        logger.error(f"❌ Retraining job {job_id} timed out after {timeout}s")
+        _update(job_id, status='timeout', error=f'Timed out after {timeout} seconds')
+
+    except Exception as e:
+        logger.error(f"❌ Retraining job {job_id} error: {e}")
+        _update(job_id, status='failed', error=str(e))
+
+    finally:
+        _update(job_id, finished=True, finished_at=datetime.now().isoformat())
+        try:
+            if on_finish:
+                on_finish()
+        finally:
+            release()
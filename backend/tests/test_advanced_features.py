@@ -0,0 +1,48 @@
+"""
+Unit Tests for the vectorised rolling kernels in advanced_features
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from models.advanced_features import _rolling_slope, _rolling_autocorr
+
+
+class RollingKernelTestCase(unittest.TestCase):
+    """Kernels must match the pandas rolling().apply() they replace"""
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.values = np.abs(rng.normal(0.01, 0.002, 300))
+        self.values[100:110] = 0.01  # flat stretch -> zero variance windows
+
+    def test_rolling_slope_matches_polyfit(self):
+        series = pd.Series(self.values)
+        for window in [12, 24, 72]:
+            expected = series.rolling(window).apply(
+                lambda x: np.polyfit(np.arange(len(x)), x, 1)[0], raw=True
+            )
+            np.testing.assert_allclose(_rolling_slope(self.values, window), expected, atol=1e-12)
+
+    def test_rolling_autocorr_matches_series_autocorr(self):
+        series = pd.Series(self.values)
+        for lag in [1, 6, 12, 24]:
+            expected = series.rolling(window=50, min_periods=lag + 1).apply(
+                lambda x: pd.Series(x).autocorr(lag=lag), raw=True
+            )
+            np.testing.assert_allclose(_rolling_autocorr(self.values, lag), expected, atol=1e-9)
+
+    def test_short_series(self):
+        short = self.values[:5]
+        self.assertTrue(np.isnan(_rolling_slope(short, 12)).all())
+        self.assertEqual(len(_rolling_autocorr(short, 24)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,225 @@
+"""
+Unit Tests for the API response cache
+"""
+
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+import api.cache as cache_module
+from api.cache import cache, cached, clear_cache, cache_key, _encode, _decode
+
+
+class CacheTestCase(unittest.TestCase):
+    """Test cases for the @cached decorator"""
+
+    def setUp(self):
+        clear_cache()
+        self.calls = 0
+
+    def test_cache_key_is_hashable_tuple(self):
+        """Keys are plain tuples of the arguments"""
+        self.assertEqual(cache_key(1, 'a', b=2), (1, 'a', ('b', 2)))
+        self.assertEqual(cache_key(b=2, a=1), cache_key(a=1, b=2))
+
+    def test_repeated_call_hits_cache(self):
+        """Second call with the same args is served from cache"""
+        @cached(ttl=60)
+        def compute(x):
+            self.calls += 1
+            return x * 2
+
+        self.assertEqual(compute(2), 4)
+        self.assertEqual(compute(2), 4)
+        self.assertEqual(self.calls, 1)
+
+        compute(3)
+        self.assertEqual(self.calls, 2)
+
+    def test_query_string_is_part_of_key(self):
+        """Views reading request.args get one entry per query string"""
+        app = Flask(__name__)
+
+        @cached(ttl=60)
+        def view():
+            self.calls += 1
+            from flask import request
+            return request.args.get('horizon')
+
+        with app.test_request_context('/?horizon=1h'):
+            self.assertEqual(view(), '1h')
+        with app.test_request_context('/?horizon=4h'):
+            self.assertEqual(view(), '4h')
+        with app.test_request_context('/?horizon=1h'):
+            self.assertEqual(view(), '1h')
+        self.assertEqual(self.calls, 2)
+
+    def test_vary_on_query_false_shares_entries(self):
+        """Helpers keyed on their arguments ignore the query string"""
+        app = Flask(__name__)
+
+        @cached(ttl=60, vary_on_query=False)
+        def helper(urgency):
+            self.calls += 1
+            return urgency
+
+        with app.test_request_context('/?urgency=0.50'):
+            self.assertEqual(helper(0.5), 0.5)
+        with app.test_request_context('/', method='POST'):
+            self.assertEqual(helper(0.5), 0.5)
+        self.assertEqual(self.calls, 1)
+
+    def test_etag_answers_matching_if_none_match_with_304(self):
+        """etag=True responses carry an ETag and revalidate to an empty 304"""
+        app = Flask(__name__)
+
+        @cached(ttl=60, etag=True)
+        def view():
+            self.calls += 1
+            return jsonify({'value': 1})
+
+        with app.test_request_context('/'):
+            first = view()
+        etag, _ = first.get_etag()
+        self.assertTrue(etag)
+
+        with app.test_request_context('/', headers={'If-None-Match': f'"{etag}"'}):
+            second = view()
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.get_data(), b'')
+        self.assertEqual(second.get_etag()[0], etag)
+
+        with app.test_request_context('/', headers={'If-None-Match': '"stale"'}):
+            self.assertEqual(view().status_code, 200)
+        self.assertEqual(self.calls, 1)
+
+    def test_etag_rewritten_by_compression_still_matches(self):
+        """Tags sent back with flask-compress's ":<encoding>" suffix revalidate too"""
+        app = Flask(__name__)
+
+        @cached(ttl=60, etag=True)
+        def view():
+            return jsonify({'value': 1})
+
+        with app.test_request_context('/'):
+            etag, _ = view().get_etag()
+
+        with app.test_request_context('/', headers={'If-None-Match': f'"{etag}:br"'}):
+            response = view()
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_etag()[0], f'{etag}:br')
+
+    def test_etag_leaves_cache_control_to_the_app(self):
+        """Cache-Control stays with the app's per-path rules, not the cache"""
+        app = Flask(__name__)
+
+        @cached(ttl=30, etag=True)
+        def view():
+            return jsonify({'value': 1})
+
+        with app.test_request_context('/'):
+            self.assertNotIn('Cache-Control', view().headers)
+
+    def test_static_json_response_matches_compressed_etag(self):
+        """Prebuilt responses revalidate against flask-compress's suffixed tags"""
+        from api.utils import prebuilt_json, static_json_response
+        app = Flask(__name__)
+        prebuilt = prebuilt_json({'value': 1})
+
+        with app.test_request_context('/', headers={'If-None-Match': f'"{prebuilt[1]}:gzip"'}):
+            response = static_json_response(prebuilt)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_etag()[0], f'{prebuilt[1]}:gzip')
+
+        with app.test_request_context('/'):
+            self.assertEqual(static_json_response(prebuilt).get_json(), {'value': 1})
+
+    def test_hits_get_their_own_response(self):
+        """Cached responses are rebuilt per hit, so header changes do not leak"""
+        app = Flask(__name__)
+
+        @cached(ttl=60)
+        def view():
+            self.calls += 1
+            return jsonify({'value': 1}), 201
+
+        with app.test_request_context('/'):
+            first, status = view()
+            first.headers['Access-Control-Allow-Origin'] = 'https://a.example'
+        with app.test_request_context('/'):
+            second, second_status = view()
+
+        self.assertIsNot(second, first)
+        self.assertEqual(second_status, 201)
+        self.assertEqual(second.get_json(), {'value': 1})
+        self.assertNotIn('Access-Control-Allow-Origin', second.headers)
+        self.assertEqual(self.calls, 1)
+
+    @unittest.skipUnless(cache_module.REDIS_AVAILABLE, "redis/orjson not installed")
+    def test_shared_encoding_round_trips(self):
+        """Results published to Redis decode back to equivalent results"""
+        app = Flask(__name__)
+
+        value = {'1h': 0.01, 'nested': [1, 2]}
+        self.assertEqual(_decode(_encode(value)), value)
+
+        with app.test_request_context('/'):
+            response, status = _decode(_encode((jsonify({'error': 'x'}), 404)))
+        self.assertEqual(status, 404)
+        self.assertEqual(response.get_json(), {'error': 'x'})
+
+        # Not JSON-shaped: kept in the per-process cache only
+        self.assertIsNone(_encode(object()))
+
+    def test_concurrent_misses_compute_once(self):
+        """Concurrent callers on a cold key share a single computation"""
+        @cached(ttl=60)
+        def slow():
+            self.calls += 1
+            time.sleep(0.2)
+            return 'done'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(slow())) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, ['done'] * 5)
+        self.assertEqual(self.calls, 1)
+
+    def test_expired_entry_is_served_stale_during_refresh(self):
+        """While one caller refreshes an expired entry, the others get the previous result"""
+        started = threading.Event()
+
+        @cached(ttl=60)
+        def slow():
+            self.calls += 1
+            if self.calls > 1:
+                started.set()
+                time.sleep(0.2)
+            return self.calls
+
+        self.assertEqual(slow(), 1)
+        # Expire the fresh entry, keeping the previous result
+        cache.clear()
+
+        refresh = threading.Thread(target=slow)
+        refresh.start()
+        started.wait(timeout=5)
+        self.assertEqual(slow(), 1)
+        refresh.join()
+
+        self.assertEqual(slow(), 2)
+        self.assertEqual(self.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Unit Tests for the /predictions external feature helper
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from api.routes import _external_features
+
+
+def _pandas_features(gas_price):
+    """The pandas formulation used in training"""
+    g = pd.Series(gas_price, dtype=float)
+    volatility = g.rolling(window=12, min_periods=1).std().fillna(0)
+    return {
+        'recent_volatility': volatility,
+        'congestion_score': (volatility / g.rolling(window=12, min_periods=1).mean()).fillna(0),
+        'gas_change': g.diff().abs().fillna(0),
+        'momentum_1h': g.pct_change(12).fillna(0),
+        'momentum_4h': g.pct_change(48).fillna(0)
+    }
+
+
+class ExternalFeaturesTestCase(unittest.TestCase):
+    """_external_features() against the pandas formulation"""
+
+    def assertMatchesPandas(self, gas_price, atol=1e-12):
+        expected = _pandas_features(gas_price)
+        actual = _external_features(np.asarray(gas_price, dtype=float))
+        for name, column in expected.items():
+            np.testing.assert_allclose(actual[name], column.to_numpy(), rtol=1e-9, atol=atol, err_msg=name)
+
+    def test_matches_pandas_on_noisy_history(self):
+        rng = np.random.default_rng(0)
+        self.assertMatchesPandas(0.005 + rng.random(576) * 0.002)
+
+    def test_short_histories(self):
+        for n in range(0, 14):
+            self.assertMatchesPandas(np.linspace(0.004, 0.006, n))
+
+    def test_flat_history_has_exactly_zero_volatility(self):
+        """Windows of identical prices give 0, not rounding noise"""
+        gas_price = np.concatenate((np.full(30, 0.0123456), 0.01 + np.arange(20) * 1e-4, np.full(30, 0.0123456)))
+        features = _external_features(gas_price)
+        flat = np.r_[0:30, 61:80]
+        self.assertTrue(np.all(features['recent_volatility'][flat] == 0))
+        self.assertTrue(np.all(features['congestion_score'][flat] == 0))
+        # pandas' running sums leave ~1e-10 of noise in the flat windows
+        # that follow the ramp; everywhere else the results agree closely
+        self.assertMatchesPandas(gas_price, atol=1e-8)
+
+        # An all-flat history is exactly 0 in both
+        self.assertMatchesPandas(np.full(50, 0.0123456), atol=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+Unit Tests for the orjson JSON provider
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from flask import Flask, jsonify
+import numpy as np
+from api.json_provider import OrjsonProvider
+
+
+class OrjsonProviderTestCase(unittest.TestCase):
+    """jsonify() output should match the stdlib provider"""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.json = OrjsonProvider(self.app)
+
+    def test_numpy_values(self):
+        with self.app.app_context():
+            response = jsonify({'mean': np.float64(0.5), 'count': np.int64(3), 'arr': np.array([1, 2])})
+        self.assertEqual(response.get_json(), {'mean': 0.5, 'count': 3, 'arr': [1, 2]})
+
+    def test_datetime_matches_stdlib(self):
+        when = datetime(2024, 1, 2, 3, 4, 5)
+        with self.app.app_context():
+            body = jsonify({'at': when}).get_json()
+        self.assertEqual(body['at'], 'Tue, 02 Jan 2024 03:04:05 GMT')
+
+    def test_request_json_roundtrip(self):
+        @self.app.route('/echo', methods=['POST'])
+        def echo():
+            from flask import request
+            return jsonify(request.get_json())
+
+        response = self.app.test_client().post('/echo', json={'urgency': 0.7})
+        self.assertEqual(response.get_json(), {'urgency': 0.7})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Unit Tests for the background retraining job runner
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import retrain_jobs
+
+
+class RetrainJobsTestCase(unittest.TestCase):
+    """Test cases for submit_script / get_job"""
+
+    def setUp(self):
+        self.assertTrue(self._wait_idle(), "retraining slot still held")
+        # Keep job status out of the real shared file
+        state_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, state_dir)
+        self.addCleanup(setattr, retrain_jobs, 'JOBS_PATH', retrain_jobs.JOBS_PATH)
+        retrain_jobs.JOBS_PATH = os.path.join(state_dir, 'jobs.json')
+
+    def _wait_idle(self, attempts=500):
+        """Wait for the previous job to release the slot (on_finish runs just before)"""
+        for _ in range(attempts):
+            if retrain_jobs.try_acquire():
+                retrain_jobs.release()
+                return True
+            threading.Event().wait(0.01)
+        return False
+
+    def _script(self, body):
+        fd, path = tempfile.mkstemp(suffix='.py')
+        with os.fdopen(fd, 'w') as f:
+            f.write(body)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_job_runs_and_reports_success(self):
+        """A submitted script runs in the background and records its output"""
+        finished = threading.Event()
+        job, accepted = retrain_jobs.submit_script(
+            self._script("print('trained')"), timeout=30, on_finish=finished.set
+        )
+        self.assertTrue(accepted)
+        self.assertTrue(finished.wait(30))
+
+        status = retrain_jobs.get_job(job['job_id'])
+        self.assertEqual(status['status'], 'succeeded')
+        self.assertIn('trained', status['output'])
+
+    def test_overlapping_submit_is_rejected(self):
+        """A second trigger while one is running returns the running job"""
+        finished = threading.Event()
+        script = self._script("import time; time.sleep(1)")
+
+        first, accepted = retrain_jobs.submit_script(script, timeout=30, on_finish=finished.set)
+        self.assertTrue(accepted)
+        second, accepted = retrain_jobs.submit_script(script, timeout=30)
+        self.assertFalse(accepted)
+        self.assertEqual(second['job_id'], first['job_id'])
+
+        self.assertTrue(finished.wait(30))
+        self.assertTrue(self._wait_idle())
+
+    def test_timeout_kills_script(self):
+        """A script running past its timeout is killed and reported"""
+        finished = threading.Event()
+        job, _ = retrain_jobs.submit_script(
+            self._script("import time; print('start', flush=True); time.sleep(30)"),
+            timeout=0.5, on_finish=finished.set
+        )
+        self.assertTrue(finished.wait(10))
+        self.assertEqual(retrain_jobs.get_job(job['job_id'])['status'], 'timeout')
+
+    def test_status_is_visible_to_other_workers(self):
+        """Another process (gunicorn worker) can read a job's status"""
+        finished = threading.Event()
+        job, _ = retrain_jobs.submit_script(self._script("print('trained')"), timeout=30, on_finish=finished.set)
+        self.assertTrue(finished.wait(30))
+
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = (
+            "from services import retrain_jobs\n"
+            f"retrain_jobs.JOBS_PATH = {retrain_jobs.JOBS_PATH!r}\n"
+            f"print(retrain_jobs.get_job({job['job_id']!r})['status'])"
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=backend_dir,
+                                capture_output=True, text=True, timeout=30)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], 'succeeded')
+
+    def test_unknown_job(self):
+        self.assertIsNone(retrain_jobs.get_job('missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()
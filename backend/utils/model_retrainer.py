@@ -39,6 +39,10 @@ class ModelRetrainer:
         self.validator = PredictionValidator()
         self.db = DatabaseManager()
         self.backup_dir = f"{models_dir}/backups"
+        # One JSON line per backup, appended as backups are made
+        self.backup_index = f"{self.backup_dir}/backups_index.jsonl"
+        # Parsed index, keyed by the file's (mtime, size) when it was read
+        self._history_cache = (None, [])
 
         # Create directories
         os.makedirs(self.models_dir, exist_ok=True)
@@ -142,6 +146,7 @@ class ModelRetrainer:
         """
         try:
             from data.database import GasPrice
+            from sqlalchemy import func
 
             session = self.db._get_session()
             try:
@@ -155,10 +160,11 @@ class ModelRetrainer:
 
                 last_training_time = datetime.fromisoformat(metadata.get('training_timestamp', '2000-01-01'))
 
-                # Count new records since last training
-                new_records = session.query(GasPrice).filter(
+                # Count new records since last training; a plain COUNT over the
+                # timestamp index, not Query.count()'s SELECT-everything subquery
+                new_records = session.query(func.count(GasPrice.id)).filter(
                     GasPrice.timestamp > last_training_time
-                ).count()
+                ).scalar()
 
                 logger.info(f"New data since last training: {new_records:,} records")
 
@@ -185,11 +191,19 @@ class ModelRetrainer:
             os.makedirs(backup_path, exist_ok=True)
 
             # Copy all model files
+            files = []
             for file in os.listdir(self.models_dir):
                 if file.endswith(('.pkl', '.h5', '.json')):
                     src = f"{self.models_dir}/{file}"
                     dst = f"{backup_path}/{file}"
                     shutil.copy2(src, dst)
+                    files.append(file)
+
+            self._append_backup_index({
+                'timestamp': datetime.strptime(timestamp, "%Y%m%d_%H%M%S").isoformat(),
+                'backup_path': backup_path,
+                'files': files
+            })
 
             logger.info(f"Backed up models to {backup_path}")
             return backup_path
@@ -198,6 +212,59 @@ class ModelRetrainer:
             logger.error(f"Error backing up models: {e}")
             raise
 
+    def get_backup_history(self, limit: int = 20) -> Tuple[int, list]:
+        """
+        Recorded backups, newest first
+
+        Reads the backup index; a tree without one (backups made before the
+        index existed) is scanned once and the index written from it. The
+        parsed index is reused until the file's mtime or size changes.
+
+        Returns:
+            (total_backups, up to `limit` backup entries)
+        """
+        if not os.path.exists(self.backup_index):
+            self._rebuild_backup_index()
+
+        stat = os.stat(self.backup_index)
+        key, entries = self._history_cache
+        if key != (stat.st_mtime_ns, stat.st_size):
+            with open(self.backup_index) as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+            self._history_cache = ((stat.st_mtime_ns, stat.st_size), entries)
+
+        backups = entries[-limit:][::-1]
+        return len(entries), backups
+
+    def _append_backup_index(self, entry: Dict):
+        """Record one backup in the index"""
+        if not os.path.exists(self.backup_index):
+            self._rebuild_backup_index()
+            return
+        with open(self.backup_index, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    def _rebuild_backup_index(self):
+        """Write the index from the backup folders on disk, oldest first"""
+        backups = []
+        for backup_folder in os.listdir(self.backup_dir):
+            if not backup_folder.startswith('backup_'):
+                continue
+            backup_path = f"{self.backup_dir}/{backup_folder}"
+            try:
+                timestamp = datetime.strptime(backup_folder.replace('backup_', ''), "%Y%m%d_%H%M%S")
+            except ValueError:
+                continue
+            backups.append({
+                'timestamp': timestamp.isoformat(),
+                'backup_path': backup_path,
+                'files': os.listdir(backup_path) if os.path.isdir(backup_path) else []
+            })
+
+        backups.sort(key=lambda x: x['timestamp'])
+        with open(self.backup_index, 'w') as f:
+            f.writelines(json.dumps(b) + '\n' for b in backups)
+
     def restore_models(self, backup_path: str):
         """
         Restore models from backup
@@ -210,7 +277,9 @@ class ModelRetrainer:
                 if file.endswith(('.pkl', '.h5', '.json')):
                     src = f"{backup_path}/{file}"
                     dst = f"{self.models_dir}/{file}"
-                    shutil.copy2(src, dst)
+                    # Copy then rename: the API memory-maps the live model files
+                    shutil.copy2(src, dst + '.tmp')
+                    os.replace(dst + '.tmp', dst)
 
             logger.info(f"Restored models from {backup_path}")
 
@@ -107,6 +107,31 @@ class PredictionValidator:
         finally:
             session.close()
 
+    def log_predictions(self, rows: List[tuple]) -> None:
+        """
+        Log several predictions for future validation in one transaction
+
+        Args:
+            rows: (horizon, predicted_gas, target_time, model_version) tuples
+        """
+        session = self.db._get_session()
+        try:
+            now = datetime.now()
+            session.add_all([
+                PredictionLog(
+                    prediction_time=now,
+                    target_time=target_time,
+                    horizon=horizon,
+                    predicted_gas=predicted_gas,
+                    model_version=model_version,
+                    validated=False
+                )
+                for horizon, predicted_gas, target_time, model_version in rows
+            ])
+            session.commit()
+        finally:
+            session.close()
+
     def validate_predictions(self, max_age_hours: int = 48) -> Dict:
         """
         Validate pending predictions by comparing with actual gas prices